@@ -0,0 +1,72 @@
+# ---------- helpers compartidos por las animaciones del avatar ----------
+# Requiere: NAOqi (qi) corriendo en el robot
+import qi
+
+from ._steps import NEUTRAL_NAMES, _union_names, _keyframes
+from .scripts import script
+
+session = qi.Session()
+session.connect("tcp://127.0.0.1:9559")
+motion_service = session.service("ALMotion")
+
+# Métodos disponibles según la versión de NAOqi (fijo por proceso)
+_CAPS = {name for name in ("wakeUp", "setBreathEnabled",
+                           "setExternalCollisionProtectionEnabled", "setStiffnesses")
+         if hasattr(motion_service, name)}
+
+# prep()/restore() anidados (varios gestos seguidos) solo pagan las RPC
+# en el prep() más externo y en su restore()
+_prep_depth = 0
+
+def prep():
+    global _prep_depth
+    _prep_depth += 1
+    if _prep_depth > 1:
+        return
+    # wakeUp tarda 1-2 s en rigidizar los motores: se lanza como future de qi
+    # (_async=True) y mientras tanto se configuran los flags
+    wake_future = motion_service.wakeUp(_async=True) if "wakeUp" in _CAPS else None
+    if "setBreathEnabled" in _CAPS:
+        motion_service.setBreathEnabled("Body", 0)
+    if "setExternalCollisionProtectionEnabled" in _CAPS:
+        motion_service.setExternalCollisionProtectionEnabled("Arms", 0)
+    if wake_future is not None:
+        wake_future.wait()
+    # Después de wakeUp, que deja la rigidez al máximo
+    if "setStiffnesses" in _CAPS:
+        motion_service.setStiffnesses(["Head","LArm","RArm","Torso"], 0.9)
+
+# ---------- reproducción ----------
+def play(steps):
+    """
+    Una sola RPC angleInterpolation(names, angleLists, timeLists, True) por gesto:
+    cada articulación recibe su serie completa de ángulos/tiempos (partiendo de
+    la pose actual del robot) y el planificador las ejecuta en paralelo.
+    """
+    names = _union_names(steps)
+    times, poses = _keyframes(names, motion_service.getAngles(names, True), steps)
+    angle_lists = [list(column) for column in zip(*poses)]
+    motion_service.angleInterpolation(names, angle_lists, [times] * len(names), True)
+
+def play_gesture(name, return_neutral=True, **params):
+    """
+    Reproduce el gesto `name` de gestures.json; params pisa los valores por
+    defecto. Con return_neutral=False se omite el regreso a neutral del final
+    (útil si hay otro gesto en cola: se enlaza directo con su primera pose).
+    """
+    steps = script(name, **params)
+    if not return_neutral and steps and steps[-1][0] is NEUTRAL_NAMES:
+        steps = steps[:-1]
+    play(steps)
+
+def restore():
+    global _prep_depth
+    _prep_depth = max(_prep_depth - 1, 0)
+    if _prep_depth > 0:
+        return
+    if "setExternalCollisionProtectionEnabled" in _CAPS:
+        motion_service.setExternalCollisionProtectionEnabled("Arms", 1)
+    if "setBreathEnabled" in _CAPS:
+        motion_service.setBreathEnabled("Body", 1)
+    # try: motion_service.rest()
+    # except: pass
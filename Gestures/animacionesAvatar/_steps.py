@@ -0,0 +1,119 @@
+# ---------- pasos y keyframes de las animaciones (sin NAOqi) ----------
+# Solo Python puro: _common los convierte en la RPC angleInterpolation del robot.
+import json
+import os
+from array import array
+
+# Postura neutral del usuario (misma para todas las animaciones)
+NEUTRAL_NAMES = ("HeadPitch", "HeadYaw", "LHand", "RHand",
+                 "LShoulderPitch", "RShoulderPitch", "LElbowRoll", "RElbowRoll",
+                 "HipPitch", "HipRoll")
+NEUTRAL_TARGETS = (-0.08, 0.05, 0.30, 0.30,
+                   1.00, 1.00, -0.30, 0.30,
+                   0.00, 0.00)
+
+# ---------- pasos (names, targets, speed) ----------
+# Velocidad máxima aprox. por articulación (rad/s; manos en unidades/s)
+_MAX_VELOCITY = {
+    "HeadYaw": 7.33, "HeadPitch": 9.23,
+    "LShoulderPitch": 7.33, "RShoulderPitch": 7.33,
+    "LShoulderRoll": 9.23, "RShoulderRoll": 9.23,
+    "LElbowYaw": 7.33, "RElbowYaw": 7.33,
+    "LElbowRoll": 9.23, "RElbowRoll": 9.23,
+    "LWristYaw": 17.38, "RWristYaw": 17.38,
+    "LHand": 8.33, "RHand": 8.33,
+    "HipPitch": 2.27, "HipRoll": 2.27,
+}
+_DEFAULT_VELOCITY = 7.0
+_MIN_STEP = 0.15   # s, duración mínima de un keyframe
+
+# Cambio mínimo que vale la pena mandar (≈ holgura de los servos)
+_EPS = {"LHand": 0.02, "RHand": 0.02}
+_DEFAULT_EPS = 0.01   # rad ≈ 0.57°
+
+def hold(seconds):
+    """Paso de pausa: todas las articulaciones mantienen su valor."""
+    return (None, None, seconds)
+
+def _step_duration(current, target, speed):
+    """Duración de un paso: la mayor distancia/(speed*vmax) entre sus articulaciones."""
+    dt = _MIN_STEP
+    for name, angle in target.items():
+        vmax = _MAX_VELOCITY.get(name, _DEFAULT_VELOCITY)
+        dt = max(dt, abs(angle - current[name]) / (speed * vmax))
+    return dt
+
+def _changed(current, step_names, step_targets):
+    """Articulaciones del paso que se alejan más de su eps del valor actual."""
+    target = {}
+    for name, angle in zip(step_names, step_targets):
+        previous = current.get(name)
+        if previous is None or abs(angle - previous) > _EPS.get(name, _DEFAULT_EPS):
+            target[name] = angle
+    return target
+
+def _union_names(steps):
+    names = []
+    for step in steps:
+        for name in step[0] or ():
+            if name not in names:
+                names.append(name)
+    return names
+
+def _keyframes(names, start, steps):
+    """
+    Resuelve los pasos en keyframes absolutos partiendo de la pose `start`.
+    Devuelve (tiempos, poses): una pose completa (array('f') con todas las `names`) por paso;
+    las articulaciones que no aparecen en un paso mantienen su valor anterior.
+    """
+    current = dict(zip(names, start))
+    times = []
+    poses = []
+    t = 0.0
+    for step_names, step_targets, speed in steps:
+        if step_names is None:
+            dt = speed
+        else:
+            target = _changed(current, step_names, step_targets)
+            if not target:
+                continue   # paso sin efecto: no genera keyframe
+            dt = _step_duration(current, target, speed)
+            current.update(target)
+        t += dt
+        times.append(t)
+        # float32 contiguo: 4 bytes por ángulo en vez de un float de Python
+        poses.append(array("f", [current[name] for name in names]))
+    return times, poses
+
+# ---------- keyframes desde gestures.json ----------
+# Cada paso es {"names", "targets", "speed"}, {"hold": s} o
+# {"neutral": true, "speed"}; un valor de texto ("speed_main", "arm_pitch")
+# se sustituye por el parámetro del mismo nombre.
+_GESTURES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gestures.json")
+_gestures = None
+
+def load_gestures():
+    """Lee gestures.json una sola vez por proceso."""
+    global _gestures
+    if _gestures is None:
+        with open(_GESTURES_PATH) as f:
+            _gestures = json.load(f)
+    return _gestures
+
+def _resolve(raw_steps, values):
+    value = lambda v: v if isinstance(v, (int, float)) else values[v]
+    steps = []
+    for raw in raw_steps:
+        if "hold" in raw:
+            steps.append(hold(raw["hold"]))
+        elif raw.get("neutral"):
+            steps.append((NEUTRAL_NAMES, NEUTRAL_TARGETS, value(raw["speed"])))
+        else:
+            if len(raw["names"]) != len(raw["targets"]):
+                # zip() descartaría en silencio lo que sobre
+                raise ValueError("paso con %d names y %d targets: %r"
+                                 % (len(raw["names"]), len(raw["targets"]), raw))
+            steps.append((tuple(str(n) for n in raw["names"]),
+                          tuple(value(t) for t in raw["targets"]),
+                          value(raw["speed"])))
+    return tuple(steps)
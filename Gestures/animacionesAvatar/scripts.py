@@ -0,0 +1,27 @@
+# ---------- guiones de las animaciones (DSL declarativo) ----------
+# Un guion es una tupla de pasos (names, targets, speed); hold(s) es una
+# pausa. Se construyen desde gestures.json y se ejecutan con _common.play().
+from ._steps import load_gestures, _resolve
+
+_SCRIPTS = {}
+
+def script(name, **params):
+    """Guion del gesto `name`; params pisa los valores por defecto del JSON."""
+    gesture = load_gestures()[name]
+    values = dict(gesture["params"])
+    values.update(params)
+    key = (name, tuple(sorted(values.items())))
+    steps = _SCRIPTS.get(key)
+    if steps is None:
+        steps = _SCRIPTS[key] = _resolve(gesture["steps"], values)
+    return steps
+
+# Guiones con los parámetros por defecto (terminan en neutral)
+ANXIETY = script("anxiety")
+CALM = script("calm")
+CONFUSION = script("confussion")
+ANGER = script("frustration")
+JOY = script("joy")
+LOVE = script("love")
+SATISFACTION = script("satisfaction")
+SERENITY = script("serenity")
@@ -0,0 +1,34 @@
+# ---------- dispatcher de animaciones del avatar ----------
+# Ejecuta bajo demanda los 8 gestos de gestures.json.
+#
+# Uso (desde Gestures/):  python play.py joy anxiety ...
+# Es el único punto de entrada: los módulos de animacionesAvatar usan imports
+# relativos y no se ejecutan sueltos.
+# Con defaults se usa directamente el gesto de gestures.json, así cada gesto
+# enlaza con el siguiente sin pasar por neutral (solo el último regresa).
+from animacionesAvatar._common import play_gesture, prep, restore
+
+# Nombre del dispatcher -> clave en gestures.json
+_KEYS = {
+    "anxiety": "anxiety",
+    "calm": "calm",
+    "confusion": "confussion",
+    "frustration": "frustration",
+    "joy": "joy",
+    "love": "love",
+    "satisfaction": "satisfaction",
+    "serenity": "serenity",
+}
+
+def play(*names):
+    """Ejecuta los gestos en orden entre un único prep()/restore()."""
+    prep()
+    try:
+        for i, name in enumerate(names):
+            play_gesture(_KEYS[name], return_neutral=(i == len(names) - 1))
+    finally:
+        restore()
+
+if __name__ == "__main__":
+    import sys
+    play(*(sys.argv[1:] or ["joy"]))
@@ -1,33 +1,67 @@
 # app/config.py
-from pydantic import BaseModel
+from typing import Literal
+
+from pydantic import field_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from dotenv import load_dotenv, find_dotenv
-import os
 
 # Cargar .env con override para pisar variables previas del entorno
 load_dotenv(find_dotenv(), override=True)
 
-class Settings(BaseModel):
+class Settings(BaseSettings):
+    # Cada campo se lee de la variable de entorno homónima en mayúsculas
+    # (WEIGHT_TEXT, NEUTRAL_STRATEGY, ...); pydantic valida el tipo al arrancar.
+    model_config = SettingsConfigDict(extra="ignore")
+
     # Endpoints / modelos
-    pepper_emotion_endpoint: str = os.getenv("PEPPER_EMOTION_ENDPOINT", "http://localhost:5000/emotion")
-    asr_language: str = os.getenv("ASR_LANGUAGE", "auto")
-    text_emo_model: str = os.getenv("TEXT_EMO_MODEL", "j-hartmann/emotion-english-distilroberta-base")
-    audio_emo_model: str = os.getenv("AUDIO_EMO_MODEL", "r-f/wav2vec-english-speech-emotion-recognition")
+    pepper_emotion_endpoint: str = "http://localhost:5000/emotion"
+    asr_language: str = "auto"
+    text_emo_model: str = "j-hartmann/emotion-english-distilroberta-base"
+    audio_emo_model: str = "r-f/wav2vec-english-speech-emotion-recognition"
+    # Cuantización dinámica int8 (solo CPU): capas Linear de los pipelines HF
+    # y pesos de los LSTM servidos con ONNX Runtime. Opt-in (QUANTIZE_INT8=1):
+    # cambia ligeramente las probabilidades, validar antes de activarla
+    quantize_int8: bool = False
 
     # Pesos base
-    weight_text: float = float(os.getenv("WEIGHT_TEXT", "0.45"))
-    weight_audio: float = float(os.getenv("WEIGHT_AUDIO", "0.55"))
+    weight_text: float = 0.45
+    weight_audio: float = 0.55
 
     # Diales anti-neutral
-    neutral_penalty: float = float(os.getenv("NEUTRAL_PENALTY", "0.80"))
-    prefer_non_neutral: bool = os.getenv("PREFER_NON_NEUTRAL", "true").lower() == "true"
-    neutral_margin: float = float(os.getenv("NEUTRAL_MARGIN", "0.10"))
-    non_neutral_min: float = float(os.getenv("NON_NEUTRAL_MIN", "0.10"))
+    neutral_penalty: float = 0.80
+    prefer_non_neutral: bool = True
+    neutral_margin: float = 0.10
+    non_neutral_min: float = 0.10
 
     # Pesos dinámicos según confianza de cada canal
-    dynamic_weighting: bool = os.getenv("DYNAMIC_WEIGHTING", "true").lower() == "true"
+    dynamic_weighting: bool = True
 
     # >>> NUEVO: estrategia para 'neutral' <<<
-    # 'penalize' | 'ban_pick' | 'ban_redistribute'
-    neutral_strategy: str = os.getenv("NEUTRAL_STRATEGY", "penalize")
+    neutral_strategy: str = "penalize"
+
+    # Fusión face + audio (routers/fusion.py); defaults = ConfidenceBasedVotingFusion._default_config
+    fusion_base_audio_weight: float = 0.55
+    fusion_base_face_weight: float = 0.45
+    fusion_weight_adjustment_mode: Literal["threshold", "linear", "exponential"] = "threshold"
+    fusion_min_weight: float = 0.25
+    fusion_max_weight: float = 0.75
+    fusion_min_confidence: float = 0.30
+    fusion_strong_confidence: float = 0.75
+    fusion_boost_consensus: bool = True
+    fusion_consensus_boost: float = 1.15
+    fusion_penalize_conflict: bool = True
+    fusion_conflict_penalty: float = 0.90
+    fusion_suppress_neutral: bool = True
+    fusion_neutral_threshold: float = 0.60
+    fusion_neutral_min_gap: float = 0.15
+    fusion_debug_mode: bool = True
+    fusion_log_all_fusions: bool = True
+
+    @field_validator("neutral_strategy", mode="before")
+    @classmethod
+    def _normalize_neutral_strategy(cls, v):
+        # Acepta mayúsculas/espacios del .env. Un valor vacío o desconocido se
+        # deja pasar: cada fusionador aplica su propio default/fallback
+        return str(v or "").strip().lower()
 
 settings = Settings()
@@ -1,25 +1,42 @@
 # app/deps.py
+import os
 from functools import lru_cache
+import torch
 from transformers import pipeline
-import whisper
+from faster_whisper import WhisperModel
 from .config import settings
 
+# NLP y SER corren a la vez (ver routers/emotion.py): cada uno con la mitad de
+# los núcleos para que los pools intra-op de torch no se pisen
+torch.set_num_threads(max(1, (os.cpu_count() or 2) // 2))
+
+def _quantized(pipe):
+    """Pasa las nn.Linear del modelo a int8 dinámico; config (id2label) no cambia."""
+    if settings.quantize_int8 and pipe.device.type == "cpu":
+        pipe.model = torch.quantization.quantize_dynamic(
+            pipe.model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+    return pipe
+
 @lru_cache(maxsize=1)
 def get_asr_model():
     # Cambia "base" por "tiny"/"small" si quieres más velocidad
-    return whisper.load_model("base")
+    # CTranslate2 con pesos int8: mismo modelo, decodificación en C++
+    return WhisperModel("base", device="cpu", compute_type="int8")
 
 @lru_cache(maxsize=1)
 def get_text_emotion_pipeline():
     # return_all_scores=True para obtener todas las probabilidades
-    return pipeline("text-classification", model=settings.text_emo_model, return_all_scores=True)
+    return _quantized(
+        pipeline("text-classification", model=settings.text_emo_model, return_all_scores=True)
+    )
 
 # --- Cambios aquí ---
 # app/deps.py (solo este fragmento)
 @lru_cache(maxsize=1)
 def _audio_pipe_cached(model_name: str):
     # sin top_k aquí
-    return pipeline("audio-classification", model=model_name)
+    return _quantized(pipeline("audio-classification", model=model_name))
 
 def get_audio_emotion_pipeline():
     return _audio_pipe_cached(settings.audio_emo_model)
@@ -2,17 +2,35 @@
 import asyncio
 import json
 import logging
+from collections import deque
 from datetime import datetime, timezone
-from typing import AsyncIterator, Dict, Any
+from typing import AsyncIterator, Deque, Dict, Any, Optional
 
 from fastapi import APIRouter
 from starlette.responses import StreamingResponse
 
+try:
+    import orjson
+except ImportError:  # sin orjson se usa json de la stdlib
+    orjson = None
+
 # Router público (lo que importará main.py)
 router = APIRouter()
 
-# Cola global para eventos de log
-LOG_QUEUE: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=1000)
+# Buffer circular global para eventos de log: al llenarse descarta el más viejo
+# en O(1), sin locks desde el emit síncrono
+LOG_BUF: Deque[Dict[str, Any]] = deque(maxlen=1000)
+# Despierta al generador SSE cuando hay eventos nuevos
+LOG_EVT = asyncio.Event()
+# Loop del consumidor SSE (se fija al abrir el stream); emit puede venir de otros hilos
+_LOOP: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _dumps(evt: Dict[str, Any]) -> bytes:
+    """Serializa un evento a JSON UTF-8 (el datetime sale en ISO 8601 en ambos casos)."""
+    if orjson is not None:
+        return orjson.dumps(evt)
+    return json.dumps(evt, ensure_ascii=False, default=datetime.isoformat).encode("utf-8")
 
 
 class SSELogHandler(logging.Handler):
@@ -20,36 +38,37 @@ class SSELogHandler(logging.Handler):
     def emit(self, record: logging.LogRecord) -> None:
         try:
             evt = {
-                "ts": datetime.now(timezone.utc).isoformat(),
+                "ts": datetime.now(timezone.utc),
                 "level": record.levelname,
                 "logger": record.name,
                 "message": record.getMessage(),
             }
-            try:
-                LOG_QUEUE.put_nowait(evt)
-            except asyncio.QueueFull:
-                try:
-                    LOG_QUEUE.get_nowait()
-                except Exception:
-                    pass
-                try:
-                    LOG_QUEUE.put_nowait(evt)
-                except Exception:
-                    pass
+            LOG_BUF.append(evt)
+            if _LOOP is not None:
+                _LOOP.call_soon_threadsafe(LOG_EVT.set)
         except Exception:
             # no romper en caso de error de logging
             pass
 
 
-async def _event_gen() -> AsyncIterator[str]:
-    """Genera eventos SSE desde la cola de logs, con keepalive periódico."""
+async def _event_gen() -> AsyncIterator[bytes]:
+    """Genera eventos SSE desde el buffer de logs, con keepalive periódico."""
+    global _LOOP
+    _LOOP = asyncio.get_running_loop()
     while True:
-        try:
-            evt = await asyncio.wait_for(LOG_QUEUE.get(), timeout=15.0)
-            yield f"data: {json.dumps(evt, ensure_ascii=False)}\n\n"
-        except asyncio.TimeoutError:
-            # Comentario SSE como keepalive (no visible para el cliente)
-            yield ": keepalive\n\n"
+        if not LOG_BUF:
+            try:
+                await asyncio.wait_for(LOG_EVT.wait(), timeout=15.0)
+            except asyncio.TimeoutError:
+                # Comentario SSE como keepalive (no visible para el cliente)
+                yield b": keepalive\n\n"
+                continue
+        LOG_EVT.clear()
+        # Vacía todo lo acumulado y lo manda en un solo chunk (un send ASGI por ráfaga)
+        chunks = []
+        while LOG_BUF:
+            chunks.append(b"data: " + _dumps(LOG_BUF.popleft()) + b"\n\n")
+        yield b"".join(chunks)
 
 
 @router.get("/logs/stream")
@@ -1,9 +1,14 @@
 # app/main.py
+import logging
+
+import numpy as np
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from .routers.health import router as health_router
-from .routers.health import router as health_router
 from .routers.emotion import router as emotion_router
+from .deps import get_asr_model, get_text_emotion_pipeline, get_audio_emotion_pipeline
+
+logger = logging.getLogger("startup")
 
 
 app = FastAPI(title="Emotion Hybrid API")
@@ -18,3 +23,17 @@ app.add_middleware(
 
 app.include_router(health_router)
 app.include_router(emotion_router)
+
+
+@app.on_event("startup")
+def warm_models():
+    """Carga Whisper y los pipelines HF antes del primer request (los lru_cache quedan calientes)."""
+    get_asr_model()
+    text_pipe = get_text_emotion_pipeline()
+    audio_pipe = get_audio_emotion_pipeline()
+    # Inferencia de prueba para que torch inicialice kernels y pools de hilos
+    try:
+        text_pipe("warm up")
+        audio_pipe({"raw": np.zeros(16000, dtype=np.float32), "sampling_rate": 16000})
+    except Exception as e:
+        logger.warning("Warm-up de modelos incompleto: %s", e)
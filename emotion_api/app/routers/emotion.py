@@ -1,11 +1,21 @@
 # app/routers/emotion.py
+import asyncio
 import os
+import shutil
+import struct
 import uuid
 import tempfile
+import time
 from subprocess import run, PIPE, CalledProcessError
 
-import aiofiles
 from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+
+try:
+    import librosa
+    import soundfile as sf
+except ImportError:  # sin ellos siempre se convierte con ffmpeg
+    librosa = sf = None
 
 from ..deps import (
     get_asr_model,
@@ -15,20 +25,71 @@ from ..deps import (
 from ..services.asr_whisper import transcribe_audio_file
 from ..services.nlp_text_emotion import classify_text_emotions
 from ..services.ser_audio_emotion import classify_audio_emotions
-from ..services.fusion import fuse, pick_label
+from ..services.fusion import fuse_with_strategy, pick_label
 from ..services.mapping import map_to_face7
 from ..services.pepper_client import send_emotion_to_pepper
 from ..models.schemas import EmotionResponse, EmotionScore, PepperAck
 
 router = APIRouter(prefix="/emotion", tags=["emotion"])
 
+# Cooldown de despacho a Pepper: la misma emoción dentro de COOLDOWN_S no se
+# reenvía (el robot seguiría repitiendo el gesto que ya está haciendo)
+COOLDOWN_S = 2.0
+_LAST_SENT: dict[str, float] = {}
+
+
+def _save_upload(src, dst_path: str) -> None:
+    """Copia el spool de la subida a disco en una sola pasada (bloqueante)."""
+    src.seek(0)
+    with open(dst_path, "wb") as dst:
+        shutil.copyfileobj(src, dst, 1024 * 1024)
+
+
+def _is_wav16k_mono(path: str) -> bool:
+    """
+    True si el archivo ya es WAV PCM 16-bit, mono, 16 kHz (cabecera canónica
+    de 44 bytes), en cuyo caso no hace falta pasar por ffmpeg.
+    """
+    try:
+        with open(path, "rb") as f:
+            hdr = f.read(44)
+    except OSError:
+        return False
+    if len(hdr) < 44 or hdr[0:4] != b"RIFF" or hdr[8:16] != b"WAVEfmt ":
+        return False
+    fmt, channels, sample_rate = struct.unpack_from("<HHI", hdr, 20)
+    (bits,) = struct.unpack_from("<H", hdr, 34)
+    return fmt == 1 and channels == 1 and sample_rate == 16000 and bits == 16
+
+
+def _resample_in_process(src_path: str, dst_path: str) -> bool:
+    """
+    Decodifica y remuestrea a WAV mono 16k sin lanzar procesos (soundfile +
+    librosa). Devuelve False si libsndfile no reconoce el formato (p.ej. webm).
+    """
+    if sf is None:
+        return False
+    try:
+        y, sr = sf.read(src_path, dtype="float32", always_2d=False)
+    except Exception:
+        return False
+    if y.ndim > 1:
+        y = y.mean(axis=1)
+    if sr != 16000:
+        y = librosa.resample(y, orig_sr=sr, target_sr=16000)
+    sf.write(dst_path, y, 16000, subtype="PCM_16")
+    return True
+
 
 def _convert_to_wav16k(src_path: str) -> str:
     """
     Convierte cualquier audio a WAV mono 16k para el pipeline de SER.
-    Usa subprocess con lista de args (robusto en Windows/Linux/Mac).
+    Primero en proceso (WAV/FLAC/OGG...); si el formato no lo soporta
+    libsndfile, usa ffmpeg con lista de args (robusto en Windows/Linux/Mac).
     """
     dst_path = os.path.join(tempfile.gettempdir(), f"{uuid.uuid4()}.wav")
+    if _resample_in_process(src_path, dst_path):
+        return dst_path
     cmd = [
         "ffmpeg",
         "-nostdin",
@@ -61,7 +122,7 @@ async def emotion_from_audio(
     audio_pipe=Depends(get_audio_emotion_pipeline),
 ):
     """
-    1) Guarda el archivo subido (async, en chunks)
+    1) Guarda el archivo subido (copia del spool en el threadpool)
     2) Convierte a WAV 16k mono para SER
     3) ASR con Whisper sobre el archivo original (acepta varios formatos)
     4) NLP (texto→emoción) + SER (audio→emoción)
@@ -70,18 +131,17 @@ async def emotion_from_audio(
     """
     raw_path = wav16_path = None
     try:
-        # 1) Guardar archivo subido de forma asíncrona
+        # 1) Guardar archivo subido: FastAPI ya lo tiene en un SpooledTemporaryFile,
+        #    se copia de una vez fuera del event loop
         suffix = os.path.splitext(audio.filename or "")[1] or ".bin"
         raw_path = os.path.join(tempfile.gettempdir(), f"{uuid.uuid4()}{suffix}")
-        async with aiofiles.open(raw_path, "wb") as f:
-            while True:
-                chunk = await audio.read(1024 * 1024)  # 1 MiB
-                if not chunk:
-                    break
-                await f.write(chunk)
+        await run_in_threadpool(_save_upload, audio.file, raw_path)
 
-        # 2) Normalizar a WAV 16k mono para SER
-        wav16_path = _convert_to_wav16k(raw_path)
+        # 2) Normalizar a WAV 16k mono para SER (si ya lo es, se usa tal cual)
+        if _is_wav16k_mono(raw_path):
+            wav16_path = raw_path
+        else:
+            wav16_path = _convert_to_wav16k(raw_path)
 
         # 3) ASR (Whisper) — si falla con el original, intenta con el wav16
         try:
@@ -89,17 +149,26 @@ async def emotion_from_audio(
         except Exception:
             transcript = transcribe_audio_file(asr_model, wav16_path)
 
-        # 4) Emoción por texto y por audio
-        text_emotions = classify_text_emotions(text_pipe, transcript)
-        audio_emotions = classify_audio_emotions(audio_pipe, wav16_path)
+        # 4) Emoción por texto y por audio (independientes: en paralelo, fuera del event loop)
+        text_emotions, audio_emotions = await asyncio.gather(
+            asyncio.to_thread(classify_text_emotions, text_pipe, transcript),
+            asyncio.to_thread(classify_audio_emotions, audio_pipe, wav16_path),
+        )
 
         # 5) Fusión + mapeo FACE7
-        fused = fuse(text_emotions, audio_emotions)
-        fused_label = pick_label(fused)
+        fused, strat = fuse_with_strategy(text_emotions, audio_emotions)
+        fused_label = pick_label(fused, strat=strat)
         mapped = map_to_face7(fused_label)
 
-        # 6) Envío a Pepper
-        ok = send_emotion_to_pepper(mapped)
+        # 6) Envío a Pepper (salvo que la misma emoción se haya enviado hace poco)
+        now = time.monotonic()
+        if now - _LAST_SENT.get(mapped, float("-inf")) < COOLDOWN_S:
+            ack = PepperAck(ok=True, sent_to="pepper-cached")
+        else:
+            ok = send_emotion_to_pepper(mapped)
+            if ok:
+                _LAST_SENT[mapped] = now
+            ack = PepperAck(ok=ok, sent_to="pepper")
 
         return {
             "result": EmotionResponse(
@@ -109,7 +178,7 @@ async def emotion_from_audio(
                 fused=EmotionScore(label=fused_label, score=fused[fused_label]),
                 mapped_emotion=mapped,
             ).model_dump(),
-            "pepper": PepperAck(ok=ok, sent_to="pepper").model_dump(),
+            "pepper": ack.model_dump(),
         }
     except HTTPException:
         raise
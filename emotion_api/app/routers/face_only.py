@@ -5,12 +5,10 @@ Separado del audio para evitar contención de recursos
 """
 from __future__ import annotations
 
-import io
 import cv2
 import numpy as np
 import logging
 
-from PIL import Image
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException
 
 # ---- Modelo YOLOv8 para emociones faciales ----
@@ -43,15 +41,14 @@ async def emotion_from_frame(
       }
     """
     try:
-        # 1) Log incoming request
-        img_size = len(await image.read()) if hasattr(image, 'read') else 0
-        await image.seek(0)  # Reset for actual reading
-        logger.info(f"👤 [FACE] New frame received: {image.filename} (size: {img_size} bytes) in room {room}")
-
-        # 2) bytes -> PIL -> numpy BGR
+        # 1) Leer una sola vez y loguear el tamaño
         raw = await image.read()
-        pil = Image.open(io.BytesIO(raw)).convert("RGB")
-        img_bgr = cv2.cvtColor(np.array(pil), cv2.COLOR_RGB2BGR)
+        logger.info(f"👤 [FACE] New frame received: {image.filename} (size: {len(raw)} bytes) in room {room}")
+
+        # 2) bytes -> numpy BGR (decodifica directo a BGR en una sola llamada)
+        img_bgr = cv2.imdecode(np.frombuffer(raw, np.uint8), cv2.IMREAD_COLOR)
+        if img_bgr is None:
+            raise HTTPException(status_code=400, detail="from-frame: imagen inválida o formato no soportado")
 
         actual_size = size if size > 0 else 640
         logger.info(f"👤 [FACE] 🚀 Starting YOLOv8 detection on {img_bgr.shape} image (processing size: {actual_size})")
@@ -92,6 +89,8 @@ async def emotion_from_frame(
         # 6) Return YOLOv8 response format
         return response_data
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.exception("from-frame failed: %s", e)
         raise HTTPException(
@@ -4,37 +4,71 @@ Endpoint para fusión de emociones (Face + Audio)
 Implementa sistema de votación 2oo2 con pesos dinámicos
 """
 
-from fastapi import APIRouter, HTTPException, Form
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, HTTPException, Form, Query, Request
+from fastapi.responses import JSONResponse, Response
+from functools import lru_cache
 from typing import Dict, Any
 import logging
 
+try:
+    import orjson
+except ImportError:  # sin orjson el historial se serializa con json de la stdlib
+    orjson = None
+
 from app.state import get_emotion_buffer
 from app.routers.services.fusion_voting import get_fusion_system
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+
+class _FastJSONResponse(JSONResponse):
+    """JSONResponse con orjson (si está); los scores pueden venir como floats de NumPy."""
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+
 router = APIRouter(prefix="/fusion", tags=["emotion-fusion"])
 
-# Obtener instancia global del sistema de fusión
-fusion_system = get_fusion_system({
-    'base_audio_weight': settings.fusion_base_audio_weight,
-    'base_face_weight': settings.fusion_base_face_weight,
-    'weight_adjustment_mode': settings.fusion_weight_adjustment_mode,
-    'min_weight': settings.fusion_min_weight,
-    'max_weight': settings.fusion_max_weight,
-    'min_confidence': settings.fusion_min_confidence,
-    'strong_confidence': settings.fusion_strong_confidence,
-    'boost_consensus': settings.fusion_boost_consensus,
-    'consensus_boost': settings.fusion_consensus_boost,
-    'penalize_conflict': settings.fusion_penalize_conflict,
-    'conflict_penalty': settings.fusion_conflict_penalty,
-    'suppress_neutral': settings.fusion_suppress_neutral,
-    'neutral_threshold': settings.fusion_neutral_threshold,
-    'neutral_min_gap': settings.fusion_neutral_min_gap,
-    'debug_mode': settings.fusion_debug_mode,
-})
+
+def _not_modified(request: Request, etag: str):
+    """304 si el cliente ya tiene esta versión (If-None-Match), si no None."""
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
+
+
+def _with_etag(response: Response, etag: str) -> Response:
+    response.headers["ETag"] = etag
+    return response
+
+
+@lru_cache(maxsize=1)
+def _global_buffer_stats_body(version: int) -> bytes:
+    """Stats globales del buffer ya serializadas; se recalculan solo cuando cambia la versión."""
+    return _FastJSONResponse(content=get_emotion_buffer().get_stats()).body
+
+# Instancia global del sistema de fusión: se construye en el primer uso, no al importar
+@lru_cache(maxsize=1)
+def _fs():
+    return get_fusion_system({
+        'base_audio_weight': settings.fusion_base_audio_weight,
+        'base_face_weight': settings.fusion_base_face_weight,
+        'weight_adjustment_mode': settings.fusion_weight_adjustment_mode,
+        'min_weight': settings.fusion_min_weight,
+        'max_weight': settings.fusion_max_weight,
+        'min_confidence': settings.fusion_min_confidence,
+        'strong_confidence': settings.fusion_strong_confidence,
+        'boost_consensus': settings.fusion_boost_consensus,
+        'consensus_boost': settings.fusion_consensus_boost,
+        'penalize_conflict': settings.fusion_penalize_conflict,
+        'conflict_penalty': settings.fusion_conflict_penalty,
+        'suppress_neutral': settings.fusion_suppress_neutral,
+        'neutral_threshold': settings.fusion_neutral_threshold,
+        'neutral_min_gap': settings.fusion_neutral_min_gap,
+        'debug_mode': settings.fusion_debug_mode,
+    })
 
 
 @router.post("/fuse")
@@ -67,7 +101,7 @@ async def fuse_emotions(
         }
 
         # Fusionar
-        result = fusion_system.fuse(face_result, audio_result)
+        result = _fs().fuse(face_result, audio_result)
 
         logger.info(f"[FUSION] Manual fusion for room {room}: {result['emotion']} ({result['confidence']:.2f}) via {result['strategy']}")
 
@@ -110,16 +144,15 @@ async def auto_fuse(room: str = Form(...)):
             raise HTTPException(status_code=400, detail="No hay detección de audio reciente para esta room")
 
         # Fusionar con suavizado temporal (pasar room para tracking de historial)
-        result = fusion_system.fuse(face_result, audio_result, room=room)
+        result = _fs().fuse(face_result, audio_result, room=room)
 
         # Log con información temporal si está disponible
-        temporal_info = result.get('temporal', {})
-        temporal_flag = f" [{temporal_info.get('adjustment', 'none')}]" if temporal_info.get('adjustment') else ""
-
-        if settings.fusion_log_all_fusions:
+        if settings.fusion_log_all_fusions and logger.isEnabledFor(logging.INFO):
+            adjustment = (result.get('temporal') or {}).get('adjustment')
             logger.info(
-                f"[FUSION] Auto-fusion for room {room}: {result['emotion']} "
-                f"({result['confidence']:.2f}) via {result['strategy']}{temporal_flag}"
+                "[FUSION] Auto-fusion for room %s: %s (%.2f) via %s%s",
+                room, result['emotion'], result['confidence'], result['strategy'],
+                " [%s]" % adjustment if adjustment else "",
             )
 
         return JSONResponse(content=result)
@@ -132,7 +165,7 @@ async def auto_fuse(room: str = Form(...)):
 
 
 @router.get("/buffer-stats")
-def get_buffer_stats(room: str = None):
+def get_buffer_stats(request: Request, room: str = None):
     """
     Obtiene estadísticas del buffer de emociones
 
@@ -141,8 +174,17 @@ def get_buffer_stats(room: str = None):
     """
     try:
         buffer = get_emotion_buffer()
-        stats = buffer.get_stats(room)
-        return JSONResponse(content=stats)
+        if room:
+            # Incluye edades (ms) calculadas con el reloj actual: no se cachea
+            return JSONResponse(content=buffer.get_stats(room))
+
+        version = buffer.version
+        etag = f'W/"buf-{version}"'
+        cached = _not_modified(request, etag)
+        if cached is not None:
+            return cached
+        body = _global_buffer_stats_body(version)
+        return Response(content=body, media_type="application/json", headers={"ETag": etag})
 
     except Exception as e:
         logger.error(f"[FUSION] Error getting buffer stats: {str(e)}")
@@ -150,11 +192,12 @@ def get_buffer_stats(room: str = None):
 
 
 @router.get("/config")
-def get_config():
+def get_config(request: Request):
     """
     Obtiene configuración actual del sistema de fusión
     """
-    return JSONResponse(content=fusion_system.config)
+    etag = f'W/"cfg-{_fs()._config_version}"'
+    return _not_modified(request, etag) or _with_etag(JSONResponse(content=_fs().config), etag)
 
 
 @router.post("/config")
@@ -170,11 +213,11 @@ def update_config(config: Dict[str, Any]):
     }
     """
     try:
-        fusion_system.update_config(config)
+        _fs().update_config(config)
         logger.info(f"[FUSION] Config updated: {config}")
         return JSONResponse(content={
             "status": "updated",
-            "config": fusion_system.config
+            "config": _fs().config
         })
 
     except Exception as e:
@@ -183,11 +226,12 @@ def update_config(config: Dict[str, Any]):
 
 
 @router.get("/temporal-config")
-def get_temporal_config():
+def get_temporal_config(request: Request):
     """
     Obtiene configuración actual del suavizado temporal
     """
-    return JSONResponse(content=fusion_system.temporal_config)
+    etag = f'W/"cfg-{_fs()._config_version}"'
+    return _not_modified(request, etag) or _with_etag(JSONResponse(content=_fs().temporal_config), etag)
 
 
 @router.post("/temporal-config")
@@ -204,11 +248,11 @@ def update_temporal_config(config: Dict[str, Any]):
     }
     """
     try:
-        fusion_system.temporal_config.update(config)
+        _fs().update_temporal_config(config)
         logger.info(f"[FUSION] Temporal config updated: {config}")
         return JSONResponse(content={
             "status": "updated",
-            "temporal_config": fusion_system.temporal_config
+            "temporal_config": _fs().temporal_config
         })
 
     except Exception as e:
@@ -217,17 +261,23 @@ def update_temporal_config(config: Dict[str, Any]):
 
 
 @router.get("/history/{room}")
-def get_fusion_history(room: str):
+def get_fusion_history(request: Request, room: str, limit: int = Query(50, ge=1)):
     """
-    Obtiene el historial de fusiones de una room (para debug)
+    Obtiene el historial de fusiones de una room (para debug);
+    solo las últimas `limit` entradas
     """
     try:
-        history = fusion_system.fusion_history.get(room, [])
-        persistence = fusion_system.persistence_systems.get(room, None)
+        etag = f'W/"hist-{_fs()._history_version}-{limit}"'
+        cached = _not_modified(request, etag)
+        if cached is not None:
+            return cached
+
+        history = _fs().fusion_history.get(room, ())
+        persistence = _fs().persistence_systems.get(room, None)
 
         result = {
             "room": room,
-            "history": history,
+            "history": list(history)[-limit:],
             "history_size": len(history),
         }
 
@@ -237,7 +287,7 @@ def get_fusion_history(room: str):
                 "last_strong_confidence": persistence.last_strong_confidence,
             }
 
-        return JSONResponse(content=result)
+        return _with_etag(_FastJSONResponse(content=result), etag)
 
     except Exception as e:
         logger.error(f"[FUSION] Error getting history: {str(e)}")
@@ -257,13 +307,13 @@ async def clear_buffer(room: str = Form(None)):
 
         if room:
             buffer.clear_room(room)
-            fusion_system.clear_room_history(room)
+            _fs().clear_room_history(room)
             message = f"Buffer AND fusion history cleared for room: {room}"
         else:
             buffer.clear_all()
             # Limpiar historial de todas las rooms
-            for room_id in list(fusion_system.fusion_history.keys()):
-                fusion_system.clear_room_history(room_id)
+            for room_id in list(_fs().fusion_history.keys()):
+                _fs().clear_room_history(room_id)
             message = "All buffers AND fusion history cleared"
 
         logger.info(f"[FUSION] {message}")
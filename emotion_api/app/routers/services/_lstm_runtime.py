@@ -0,0 +1,113 @@
+# app/routers/services/_lstm_runtime.py
+"""
+Inference runtime shared by the LSTM speech emotion models (TESS, CREMA-D):
+ONNX Runtime session when available, traced tf.function otherwise.
+"""
+
+import logging
+import os
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+import tensorflow as tf
+
+from app.config import settings
+
+try:
+    import onnxruntime as ort
+except ImportError:  # without onnxruntime the model runs through TensorFlow
+    ort = None
+
+try:
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+except ImportError:
+    quantize_dynamic = None
+
+try:
+    import tf2onnx
+except ImportError:  # only needed to (re)export best_model.onnx
+    tf2onnx = None
+
+logger = logging.getLogger(__name__)
+
+
+def _is_stale(derived_path: str, source_path: str) -> bool:
+    """True if derived_path is missing or older than the file it was built from"""
+    return (not os.path.exists(derived_path)
+            or os.path.getmtime(derived_path) < os.path.getmtime(source_path))
+
+
+def load_onnx_session(model, keras_path: str, onnx_path: str,
+                      int8_path: str) -> Tuple[Optional[object], Optional[str]]:
+    """
+    Open an ONNX Runtime session for `model` when possible.
+
+    best_model.onnx is exported from the Keras model (needs tf2onnx) and reused
+    while it is newer than keras_path; a retrained best_model.keras triggers a
+    fresh export. With QUANTIZE_INT8 on, a dynamically quantized copy (int8
+    weights) is derived the same way from the .onnx and loaded instead.
+
+    Returns (session, input_name), or (None, None) on any failure so that
+    predictions go through TensorFlow.
+    """
+    if ort is None:
+        return None, None
+    try:
+        if _is_stale(onnx_path, keras_path):
+            if tf2onnx is None:  # an old .onnx would serve the previous weights
+                return None, None
+            signature = (tf.TensorSpec(model.input_shape, tf.float32, name="input"),)
+            tf2onnx.convert.from_keras(model, input_signature=signature,
+                                       opset=15, output_path=onnx_path)
+            logger.info(f"Exported ONNX model to: {onnx_path}")
+
+        if settings.quantize_int8:
+            if _is_stale(int8_path, onnx_path) and quantize_dynamic is not None:
+                quantize_dynamic(onnx_path, int8_path, weight_type=QuantType.QInt8)
+                logger.info(f"Quantized ONNX model to int8: {int8_path}")
+            if not _is_stale(int8_path, onnx_path):
+                onnx_path = int8_path
+
+        sess_options = ort.SessionOptions()
+        sess_options.intra_op_num_threads = os.cpu_count() or 1
+        session = ort.InferenceSession(onnx_path, sess_options=sess_options,
+                                       providers=["CPUExecutionProvider"])
+        logger.info(f"ONNX Runtime session ready: {onnx_path}")
+        return session, session.get_inputs()[0].name
+    except Exception as e:
+        logger.warning(f"ONNX Runtime unavailable, using TensorFlow: {e}")
+        return None, None
+
+
+def build_predict_fn(model) -> Callable:
+    """
+    Wrap `model` in a tf.function with a fixed input signature so every
+    prediction reuses one traced (XLA-compiled when possible) graph instead
+    of going through Keras predict() dispatch for a batch of 1.
+    """
+    signature = [tf.TensorSpec(shape=model.input_shape, dtype=tf.float32)]
+    warmup = tf.zeros([1] + list(model.input_shape[1:]), dtype=tf.float32)
+
+    for jit_compile in (True, False):
+        fn = tf.function(
+            lambda x: model(x, training=False),
+            jit_compile=jit_compile,
+            input_signature=signature
+        )
+        try:
+            fn(warmup)  # trace/compile now, not on the first request
+            logger.info(f"Predict function ready (jit_compile={jit_compile})")
+            return fn
+        except Exception as e:
+            logger.warning(f"Could not build predict function (jit_compile={jit_compile}): {e}")
+
+    # Last resort: plain Keras call
+    return lambda x: model(x, training=False)
+
+
+def predict(session, input_name: Optional[str], predict_fn: Optional[Callable],
+            features: np.ndarray) -> np.ndarray:
+    """Run a (1, timesteps, features) batch through `session`, else `predict_fn`; returns class probabilities"""
+    if session is not None:
+        return session.run(None, {input_name: features.astype(np.float32, copy=False)})[0]
+    return predict_fn(tf.constant(features, dtype=tf.float32)).numpy()
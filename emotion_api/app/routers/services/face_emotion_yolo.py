@@ -1,11 +1,27 @@
 # app/routers/services/face_emotion_yolo.py
 from __future__ import annotations
 import os
+import threading
 import cv2
 import numpy as np
 import onnxruntime as ort
 from typing import List, Dict, Tuple
 
+try:
+    from scipy.special import expit
+except ImportError:  # sin scipy, sigmoid in-place con ufuncs de NumPy
+    expit = None
+
+try:
+    from numba import njit
+except ImportError:  # sin numba el kernel de NMS corre como Python normal
+    njit = None
+
+# Builds de OpenCV sin el módulo dnn: se usa el NMS propio (abajo).
+# NMSBoxesBatched (NMS por clase en C++) existe desde OpenCV 4.7
+_HAS_CV_NMS = hasattr(cv2, "dnn") and hasattr(cv2.dnn, "NMSBoxes")
+_HAS_CV_NMS_BATCHED = _HAS_CV_NMS and hasattr(cv2.dnn, "NMSBoxesBatched")
+
 FER7 = ["anger", "disgust", "fear", "happy", "neutral", "sad", "surprise"]
 
 def letterbox(img: np.ndarray,
@@ -32,33 +48,55 @@ def letterbox(img: np.ndarray,
     pad = (left, top)
     return img, gain, pad
 
-def xywh2xyxy(x: np.ndarray) -> np.ndarray:
-    y = np.empty_like(x)
-    y[:, 0] = x[:, 0] - x[:, 2] / 2
-    y[:, 1] = x[:, 1] - x[:, 3] / 2
-    y[:, 2] = x[:, 0] + x[:, 2] / 2
-    y[:, 3] = x[:, 1] + x[:, 3] / 2
-    return y
-
-def nms(boxes: np.ndarray, scores: np.ndarray, iou_thres: float=0.45) -> List[int]:
-    x1, y1, x2, y2 = boxes.T
-    areas = (x2 - x1) * (y2 - y1)
-    order = scores.argsort()[::-1]
-    keep = []
-    while order.size > 0:
-        i = order[0]
-        keep.append(i)
-        xx1 = np.maximum(x1[i], x1[order[1:]])
-        yy1 = np.maximum(y1[i], y1[order[1:]])
-        xx2 = np.minimum(x2[i], x2[order[1:]])
-        yy2 = np.minimum(y2[i], y2[order[1:]])
-        w = np.maximum(0.0, xx2 - xx1)
-        h = np.maximum(0.0, yy2 - yy1)
-        inter = w * h
-        iou = inter / (areas[i] + areas[order[1:]] - inter + 1e-7)
-        inds = np.where(iou <= iou_thres)[0]
-        order = order[inds + 1]
-    return keep
+def sigmoid_inplace(x: np.ndarray) -> np.ndarray:
+    if expit is not None:
+        return expit(x, out=x)
+    np.negative(x, out=x)
+    np.exp(x, out=x)
+    x += 1.0
+    return np.reciprocal(x, out=x)
+
+def _nms_kernel(boxes, scores, iou_thres):
+    """NMS greedy sobre cajas xyxy; devuelve índices conservados por score descendente."""
+    n = boxes.shape[0]
+    order = np.argsort(-scores)
+    suppressed = np.zeros(n, dtype=np.bool_)
+    keep = np.empty(n, dtype=np.int64)
+    k = 0
+    for a in range(n):
+        i = order[a]
+        if suppressed[i]:
+            continue
+        keep[k] = i
+        k += 1
+        x1, y1, x2, y2 = boxes[i, 0], boxes[i, 1], boxes[i, 2], boxes[i, 3]
+        area_i = (x2 - x1) * (y2 - y1)
+        for b in range(a + 1, n):
+            j = order[b]
+            if suppressed[j]:
+                continue
+            w = max(0.0, min(x2, boxes[j, 2]) - max(x1, boxes[j, 0]))
+            h = max(0.0, min(y2, boxes[j, 3]) - max(y1, boxes[j, 1]))
+            inter = w * h
+            area_j = (boxes[j, 2] - boxes[j, 0]) * (boxes[j, 3] - boxes[j, 1])
+            if inter / (area_i + area_j - inter + 1e-7) > iou_thres:
+                suppressed[j] = True
+    return keep[:k]
+
+if njit is not None and not _HAS_CV_NMS:
+    # Solo hace falta sin cv2.dnn; firma explícita: se compila al importar,
+    # no en el primer frame (con cv2.dnn no se paga esa compilación)
+    nms = njit("int64[::1](float32[:, ::1], float32[::1], float32)",
+               cache=True, fastmath=True)(_nms_kernel)
+else:
+    nms = _nms_kernel
+
+def cxcywh2xywh_inplace(x: np.ndarray) -> np.ndarray:
+    """cx,cy,w,h -> x,y,w,h (esquina superior izquierda) sobre el mismo arreglo."""
+    x[:, 2:4] *= 0.5            # semiancho / semialto
+    x[:, 0:2] -= x[:, 2:4]      # esquina superior izquierda
+    x[:, 2:4] *= 2.0
+    return x
 
 class FaceEmotionYOLO:
     def __init__(self, onnx_path: str, providers: list[str] | None = None,
@@ -80,8 +118,71 @@ class FaceEmotionYOLO:
         self.in_h = int(ishape[2] or 640)
         self.in_w = int(ishape[3] or 640)
 
+        # Tensor de entrada + IOBinding por hilo (ver _scratch): FastAPI sirve
+        # frames concurrentes desde el threadpool y ORT suelta el GIL al inferir
+        self._device = "cuda" if "CUDAExecutionProvider" in self.sess.get_providers() else "cpu"
+        self._tl = threading.local()
+
+        # ¿El grafo emite logits? Una inferencia de prueba (imagen vacía) con
+        # valores fuera de [0,1] lo confirma para todo el modelo. Si todo cae en
+        # [0,1] la prueba no es concluyente (logits chicos también caen ahí):
+        # None = revisar el rango en cada frame, como antes
+        buf = self._scratch().buf
+        buf.fill(0.0)
+        cls0 = self._run(buf)[:, 4:4 + self.nc]
+        self._needs_sigmoid = True if cls0.size and (cls0.max() > 1.0 or cls0.min() < 0.0) else None
+
+    def _scratch(self) -> threading.local:
+        """
+        Buffer (1,3,H,W) reutilizable del hilo actual, creado en su primer uso.
+        La entrada del IOBinding queda enlazada a ese buffer (en CPU comparte la
+        memoria, sin copia); la salida se pide en CPU porque el post-proceso es NumPy.
+        """
+        tl = self._tl
+        if getattr(tl, "buf", None) is None:
+            tl.buf = np.empty((1, 3, self.in_h, self.in_w), dtype=np.float32)
+            tl.io = self.sess.io_binding()
+            tl.in_ov = ort.OrtValue.ortvalue_from_numpy(tl.buf, self._device, 0)
+            tl.io.bind_ortvalue_input(self.inp_name, tl.in_ov)
+            tl.io.bind_output(self.out_name, "cpu")
+        return tl
+
+    def _preprocess(self, img_bgr: np.ndarray,
+                    color: int = 114) -> Tuple[np.ndarray, Tuple[float, float], Tuple[int, int]]:
+        """
+        letterbox + BGR->RGB + HWC->CHW + /255 en una sola escritura sobre el
+        buffer del hilo. Devuelve (tensor (1,3,H,W), gain, pad) como letterbox().
+        """
+        h, w = img_bgr.shape[:2]
+        r = min(self.in_w / w, self.in_h / h)
+        nw, nh = int(round(w * r)), int(round(h * r))
+        resized = cv2.resize(img_bgr, (nw, nh), interpolation=cv2.INTER_LINEAR)
+        top = (self.in_h - nh) // 2
+        left = (self.in_w - nw) // 2
+
+        buf = self._scratch().buf
+        chw = buf[0]
+        # Solo el borde lleva el color de relleno; el interior se escribe abajo
+        pad_val = color / 255.0
+        chw[:, :top] = pad_val
+        chw[:, top + nh:] = pad_val
+        chw[:, top:top + nh, :left] = pad_val
+        chw[:, top:top + nh, left + nw:] = pad_val
+        scale = np.float32(1.0 / 255.0)
+        for c, src in enumerate((2, 1, 0)):  # canal RGB <- canal BGR
+            np.multiply(resized[:, :, src], scale, out=chw[c, top:top + nh, left:left + nw],
+                        dtype=np.float32)
+        return buf, (r, r), (left, top)
+
     def _run(self, im: np.ndarray) -> np.ndarray:
-        out = self.sess.run([self.out_name], {self.inp_name: im})[0]
+        tl = self._scratch()
+        if im is tl.buf:
+            if self._device != "cpu":
+                tl.in_ov.update_inplace(tl.buf)  # host -> device
+            self.sess.run_with_iobinding(tl.io)
+            out = tl.io.copy_outputs_to_cpu()[0]
+        else:
+            out = self.sess.run([self.out_name], {self.inp_name: im})[0]
         if out.ndim == 3:
             if out.shape[1] == (4 + self.nc):      # (1,84,N)
                 out = np.transpose(out, (0, 2, 1))  # -> (1,N,84)
@@ -93,10 +194,8 @@ class FaceEmotionYOLO:
         return out  # (N, 4+nc)
 
     def predict(self, img_bgr: np.ndarray) -> List[Dict]:
-        # Letterbox EXACTO al tamaño de entrada del modelo
-        lb, gain, pad = letterbox(img_bgr, (self.in_h, self.in_w), auto=False)
-        im = lb[:, :, ::-1].transpose(2, 0, 1).astype(np.float32) / 255.0
-        im = im[None, ...]  # (1,3,H,W)
+        # Letterbox EXACTO al tamaño de entrada del modelo, ya normalizado (1,3,H,W)
+        im, gain, pad = self._preprocess(img_bgr)
 
         preds = self._run(im)
         if preds.size == 0:
@@ -105,12 +204,16 @@ class FaceEmotionYOLO:
         boxes = preds[:, :4]              # cx,cy,w,h (en sistema HxW del modelo)
         cls = preds[:, 4:4+self.nc]
 
-        # Si parecen logits, aplica sigmoid
-        if cls.max() > 1.0 or cls.min() < 0.0:
-            cls = 1 / (1 + np.exp(-cls))
+        # Si el modelo emite logits, aplica sigmoid (in-place: preds es propio de este frame)
+        needs_sigmoid = self._needs_sigmoid
+        if needs_sigmoid is None:
+            needs_sigmoid = cls.max() > 1.0 or cls.min() < 0.0
+        if needs_sigmoid:
+            sigmoid_inplace(cls)
 
-        conf = cls.max(axis=1)
+        # Top-1 en una sola pasada sobre (N, nc): argmax + gather
         cls_id = cls.argmax(axis=1)
+        conf = np.take_along_axis(cls, cls_id[:, None], axis=1)[:, 0]
 
         m = conf >= self.conf_thres
         if not np.any(m):
@@ -120,23 +223,35 @@ class FaceEmotionYOLO:
         conf = conf[m]
         cls_id = cls_id[m]
 
-        boxes = xywh2xyxy(boxes)
+        cxcywh2xywh_inplace(boxes)   # boxes[m] ya es copia: no toca la salida del modelo
 
         # Deshacer letterbox para recuperar coords en la imagen original
-        boxes[:, [0, 2]] -= pad[0]
-        boxes[:, [1, 3]] -= pad[1]
+        boxes[:, 0] -= pad[0]
+        boxes[:, 1] -= pad[1]
         boxes /= gain[0]
 
-        # NMS por clase (offset)
-        offsets = cls_id.astype(np.float32) * 4096.0
-        keep = nms(boxes + offsets[:, None], conf, self.iou_thres)
+        # NMS por clase; OpenCV trabaja directo sobre (x,y,w,h)
+        if _HAS_CV_NMS_BATCHED:
+            keep = cv2.dnn.NMSBoxesBatched(boxes.tolist(), conf.tolist(), cls_id.tolist(),
+                                           self.conf_thres, self.iou_thres)
+        else:
+            # Sin NMSBoxesBatched: truco del offset por clase (cajas de clases distintas no se tocan)
+            rects = boxes.copy()
+            rects[:, :2] += (cls_id.astype(np.float32) * 4096.0)[:, None]
+            if _HAS_CV_NMS:
+                keep = cv2.dnn.NMSBoxes(rects.tolist(), conf.tolist(), self.conf_thres, self.iou_thres)
+            else:
+                rects[:, 2:] += rects[:, :2]   # el kernel propio usa x1,y1,x2,y2
+                keep = nms(np.ascontiguousarray(rects, dtype=np.float32),
+                           np.ascontiguousarray(conf, dtype=np.float32), np.float32(self.iou_thres))
+        keep = np.asarray(keep, dtype=np.int64).reshape(-1)
 
         results: List[Dict] = []
         for i in keep:
-            x1, y1, x2, y2 = boxes[i]
+            x, y, w, h = boxes[i].tolist()
             results.append({
                 "label": FER7[int(cls_id[i])],
                 "score": float(conf[i]),
-                "box": [float(x1), float(y1), float(x2), float(y2)],
+                "box": [x, y, x + w, y + h],
             })
         return results
@@ -1,92 +1,181 @@
 # app/routers/services/fusion.py
-from typing import List, Dict
-from app.config import settings
-from .mapping import map_to_face7, FACE7
-
-# FACE7 es un set; creamos lista de no-neutrales para iteraciones ordenadas si quieres
-NON_NEUTRALS = [e for e in FACE7 if e != "neutral"]
-
-def _to_face7(scores: List[Dict]) -> Dict[str, float]:
-    d: Dict[str, float] = {}
-    for r in scores:
-        lab = map_to_face7(r["label"])
-        d[lab] = d.get(lab, 0.0) + float(r["score"])
-    for k in FACE7:
-        d.setdefault(k, 0.0)
-    return d
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import chain
+from typing import List, Dict, Mapping, Optional, Tuple, Union
 
-def _confidence(vec: Dict[str, float]) -> float:
-    vals = sorted(vec.values(), reverse=True)
-    return max(0.0, (vals[0] - vals[1])) if len(vals) >= 2 else 0.0
+import numpy as np
 
-def _emotion_diversity(vec: Dict[str, float]) -> float:
+from app.config import settings
+from .mapping import map_to_face7
+
+# Internamente cada distribución es un vector float32 de 7 posiciones en este
+# orden fijo; solo se convierte a dict al devolver el resultado de fuse().
+FACE7_ORDER = ("angry", "disgusted", "fearful", "happy", "neutral", "sad", "surprised")
+FACE7_INDEX = {k: i for i, k in enumerate(FACE7_ORDER)}
+NEUTRAL_IDX = FACE7_INDEX["neutral"]
+
+NON_NEUTRALS = [e for e in FACE7_ORDER if e != "neutral"]
+_NON_NEUTRAL_MASK = np.arange(len(FACE7_ORDER)) != NEUTRAL_IDX
+
+@dataclass(slots=True, frozen=True)
+class FusionParams:
+    """Snapshot de los settings que usan fuse()/pick_label() (sin ir a pydantic por llamada)."""
+    weight_text: float
+    weight_audio: float
+    dynamic_weighting: bool
+    neutral_penalty: float
+    neutral_strategy: str
+    prefer_non_neutral: bool
+    non_neutral_min: float
+    neutral_margin: float
+
+@lru_cache(maxsize=1)
+def get_params() -> FusionParams:
+    """Se arma una vez; si los settings cambian en caliente, llamar get_params.cache_clear()."""
+    return FusionParams(
+        weight_text=settings.weight_text,
+        weight_audio=settings.weight_audio,
+        dynamic_weighting=settings.dynamic_weighting,
+        neutral_penalty=settings.neutral_penalty,
+        neutral_strategy=(settings.neutral_strategy or "ban_redistribute").lower(),  # Changed default
+        prefer_non_neutral=settings.prefer_non_neutral,
+        non_neutral_min=settings.non_neutral_min,
+        neutral_margin=settings.neutral_margin,
+    )
+
+@lru_cache(maxsize=256)
+def _face7_idx(label: str) -> int:
+    """Etiqueta cruda del modelo -> índice FACE7 (el universo de etiquetas es chico)."""
+    return FACE7_INDEX[map_to_face7(label)]
+
+def _to_face7(scores: List[Dict]) -> np.ndarray:
+    idx_of = _face7_idx
+    idx = np.array([idx_of(r["label"]) for r in scores], dtype=np.int8)
+    w = np.asarray([r["score"] for r in scores], dtype=np.float32)
+    return np.bincount(idx, weights=w, minlength=len(FACE7_ORDER)).astype(np.float32)
+
+def _as_dict(vec: np.ndarray) -> Dict[str, float]:
+    return dict(zip(FACE7_ORDER, vec.tolist()))
+
+def _as_vec(fused: Union[Mapping[str, float], np.ndarray]) -> np.ndarray:
+    if isinstance(fused, np.ndarray):
+        return fused
+    return np.array([fused.get(k, 0.0) for k in FACE7_ORDER], dtype=np.float32)
+
+def _confidence(vec: np.ndarray) -> float:
+    top2 = np.partition(vec, -2)[-2:]
+    return max(0.0, float(top2[1] - top2[0]))
+
+def _emotion_diversity(vec: np.ndarray) -> float:
     """Measure how diverse the emotion distribution is (higher = more diverse)."""
-    vals = [v for v in vec.values() if v > 0]
-    if len(vals) <= 1:
+    p = vec[vec > 0].astype(np.float64)
+    if p.size <= 1:
         return 0.0
 
     # Calculate entropy-like measure
-    total = sum(vals)
+    total = p.sum()
     if total == 0:
         return 0.0
 
-    entropy = 0.0
-    for v in vals:
-        if v > 0:
-            p = v / total
-            entropy += p * (-1) * (p ** 0.5)  # Modified entropy
+    p /= total
+    return float(-(p * np.sqrt(p)).sum())  # Modified entropy
 
-    return entropy
+_HIGH_ENERGY = np.array(["fear", "anger", "surprise"])
 
 def _detect_emotional_intensity(text_scores: List[Dict], audio_scores: List[Dict]) -> float:
     """Detect overall emotional intensity from both sources."""
+    if not text_scores and not audio_scores:
+        return 0.0
 
-    # Check for pattern-detected emotions in text (these suggest high intensity)
-    text_pattern_emotions = [e for e in text_scores if e["label"] != "neutral" and e["score"] > 0.5]
-
-    # Check for high-energy emotions in audio
-    audio_high_emotions = [e for e in audio_scores if e["label"] in ["fear", "anger", "surprise"] and e["score"] > 0.3]
+    # Una sola pasada: etiquetas y scores de texto + audio en arreglos
+    n_text = len(text_scores)
+    rows = list(chain(text_scores, audio_scores))
+    labels = np.array([e["label"] for e in rows])
+    scores = np.fromiter((e["score"] for e in rows), dtype=np.float64, count=len(rows))
+    emotional = labels != "neutral"
 
     intensity = 0.0
 
     # Text patterns suggest urgency
-    if text_pattern_emotions:
+    if np.any(emotional[:n_text] & (scores[:n_text] > 0.5)):
         intensity += 0.4
 
     # Audio energy suggests emotion
-    if audio_high_emotions:
+    if np.any(np.isin(labels[n_text:], _HIGH_ENERGY) & (scores[n_text:] > 0.3)):
         intensity += 0.3
 
     # Multiple emotion sources suggest high intensity
-    total_emotions = len([e for e in text_scores + audio_scores if e["label"] != "neutral" and e["score"] > 0.2])
-    if total_emotions > 2:
+    if np.count_nonzero(emotional & (scores > 0.2)) > 2:
         intensity += 0.3
 
     return min(1.0, intensity)
 
-def _redistribute_neutral(f: Dict[str, float]) -> Dict[str, float]:
-    """Mueve la masa de 'neutral' a las emociones no-neutrales en proporción a sus puntajes."""
-    z = f.get("neutral", 0.0)
-    if z <= 0:
-        # no hay nada que redistribuir
-        f["neutral"] = 0.0
-        return f
-    s = sum(f[k] for k in NON_NEUTRALS)
-    if s > 0:
-        for k in NON_NEUTRALS:
-            if k in f:
-                f[k] += z * (f[k] / s)
-    else:
-        # If no non-neutral emotions, distribute equally among fear, surprise, anger
-        default_emotions = ["fear", "surprise", "anger"]
-        for k in default_emotions:
-            f[k] = f.get(k, 0.0) + z / len(default_emotions)
+# Destino de la masa neutral cuando no hay ninguna emoción presente
+_DEFAULT_IDX = [FACE7_INDEX[k] for k in ("fearful", "surprised", "angry")]
+
+def _redistribute_neutral(f: np.ndarray) -> np.ndarray:
+    """Mueve la masa de 'neutral' a las emociones no-neutrales en proporción a sus puntajes (in-place)."""
+    z = f[NEUTRAL_IDX]
+    if z > 0:
+        s = f[_NON_NEUTRAL_MASK].sum()
+        if s > 0:
+            f[_NON_NEUTRAL_MASK] *= 1.0 + z / s
+        else:
+            # If no non-neutral emotions, distribute equally among fear, surprise, anger
+            f[_DEFAULT_IDX] += z / len(_DEFAULT_IDX)
 
     # neutral queda en cero
-    f["neutral"] = 0.0
+    f[NEUTRAL_IDX] = 0.0
     return f
 
-def fuse(text_scores: List[Dict], audio_scores: List[Dict]) -> Dict[str, float]:
+def _is_trivial(text_scores: List[Dict], audio_scores: List[Dict]) -> bool:
+    """
+    Caso "sala en silencio / sin cara": todas las entradas son 'neutral' (o falta un canal).
+    Ahí la intensidad es 0 y la fusión normalizada siempre queda en neutral = 1.0.
+    """
+    total = 0.0
+    for r in chain(text_scores, audio_scores):
+        if r["label"] != "neutral":
+            return False
+        total += r["score"]
+    return total > 0
+
+def _apply_neutral_strategy(fused: np.ndarray, p: FusionParams, intensity: float) -> np.ndarray:
+    strat = p.neutral_strategy
+
+    # More aggressive neutral handling for high-intensity cases
+    if intensity > 0.4:
+        if strat == "penalize":
+            fused[NEUTRAL_IDX] *= (p.neutral_penalty * 0.5)  # Even more penalty
+        else:
+            strat = "ban_redistribute"  # Force redistribution for high intensity
+
+    if strat == "penalize":
+        fused[NEUTRAL_IDX] *= p.neutral_penalty
+    elif strat == "ban_redistribute":
+        fused = _redistribute_neutral(fused)
+    elif strat == "ban_pick":
+        # no tocamos el vector, se ignora neutral en pick_label()
+        pass
+    else:
+        # fallback: more aggressive for high intensity
+        penalty = p.neutral_penalty
+        if intensity > 0.5:
+            penalty *= 0.5
+        fused[NEUTRAL_IDX] *= penalty
+
+    return fused
+
+def _fuse_vec(text_scores: List[Dict], audio_scores: List[Dict]) -> np.ndarray:
+    p = get_params()
+
+    # Atajo: sin emociones en ningún canal no hace falta pesar ni normalizar
+    if _is_trivial(text_scores, audio_scores):
+        fused = np.zeros(len(FACE7_ORDER), dtype=np.float32)
+        fused[NEUTRAL_IDX] = 1.0
+        return _apply_neutral_strategy(fused, p, 0.0)
+
     t = _to_face7(text_scores)
     a = _to_face7(audio_scores)
 
@@ -94,10 +183,10 @@ def fuse(text_scores: List[Dict], audio_scores: List[Dict]) -> Dict[str, float]:
     intensity = _detect_emotional_intensity(text_scores, audio_scores)
 
     # Base weights
-    wt, wa = settings.weight_text, settings.weight_audio
+    wt, wa = p.weight_text, p.weight_audio
 
     # Dynamic weighting based on confidence and intensity
-    if settings.dynamic_weighting:
+    if p.dynamic_weighting:
         ct, ca = _confidence(t), _confidence(a)
         dt, da = _emotion_diversity(t), _emotion_diversity(a)
 
@@ -118,70 +207,58 @@ def fuse(text_scores: List[Dict], audio_scores: List[Dict]) -> Dict[str, float]:
         s = wt + wa
         wt, wa = (wt/s, wa/s) if s > 0 else (0.5, 0.5)
 
-    # Enhanced fusion with intensity consideration
-    fused = {k: wt * t[k] + wa * a[k] for k in FACE7}
+    # Enhanced fusion with intensity consideration (in-place sobre los vectores propios)
+    fused = np.multiply(t, wt, out=t)
+    fused += np.multiply(a, wa, out=a)
 
     # Apply intensity-based boost to non-neutral emotions
     if intensity > 0.3:
-        for k in NON_NEUTRALS:
-            if fused[k] > 0.1:  # Only boost emotions that have some presence
-                fused[k] *= (1.0 + intensity * 0.5)
+        # Only boost emotions that have some presence
+        fused[_NON_NEUTRAL_MASK & (fused > 0.1)] *= (1.0 + intensity * 0.5)
 
     # Normalize to ensure probabilities sum reasonably
-    total = sum(fused.values())
+    total = fused.sum()
     if total > 0:
-        fused = {k: v/total for k, v in fused.items()}
+        fused /= total
 
     # === Enhanced neutral strategy ===
-    strat = (settings.neutral_strategy or "ban_redistribute").lower()  # Changed default
+    return _apply_neutral_strategy(fused, p, intensity)
 
-    # More aggressive neutral handling for high-intensity cases
-    if intensity > 0.4:
-        if strat == "penalize":
-            fused["neutral"] *= (settings.neutral_penalty * 0.5)  # Even more penalty
-        else:
-            strat = "ban_redistribute"  # Force redistribution for high intensity
+def fuse_proba(text_scores: List[Dict], audio_scores: List[Dict]) -> Dict[str, float]:
+    """Fusión texto + audio normalizada; devuelve {etiqueta FACE7: score}."""
+    return _as_dict(_fuse_vec(text_scores, audio_scores))
 
-    if strat == "penalize":
-        fused["neutral"] *= settings.neutral_penalty
-    elif strat == "ban_redistribute":
-        fused = _redistribute_neutral(fused)
-    elif strat == "ban_pick":
-        # no tocamos el vector, se ignora neutral en pick_label()
-        pass
-    else:
-        # fallback: more aggressive for high intensity
-        penalty = settings.neutral_penalty
-        if intensity > 0.5:
-            penalty *= 0.5
-        fused["neutral"] *= penalty
+# Nombre histórico
+fuse = fuse_proba
 
-    return fused
+def fuse_with_strategy(text_scores: List[Dict], audio_scores: List[Dict]) -> Tuple[Dict[str, float], str]:
+    """fuse_proba() + la estrategia de neutral ya resuelta, para pasarla a pick_label()."""
+    return fuse_proba(text_scores, audio_scores), get_params().neutral_strategy
 
-def pick_label(fused: Dict[str, float]) -> str:
-    strat = (settings.neutral_strategy or "ban_redistribute").lower()  # Changed default
+def pick_label(fused: Union[Mapping[str, float], np.ndarray], strat: Optional[str] = None) -> str:
+    vec = _as_vec(fused)
+    p = get_params()
+    if strat is None:
+        strat = p.neutral_strategy
 
-    # Enhanced ban_pick logic
+    # Enhanced ban_pick logic: neutral nunca gana
     if strat == "ban_pick":
-        candidates = [(k, v) for k, v in fused.items() if k != "neutral"]
-        if not candidates:
-            return "surprise"  # Changed from "happy" to "surprise" for unknown cases
-        return max(candidates, key=lambda kv: kv[1])[0]
+        return FACE7_ORDER[int(np.argmax(np.where(_NON_NEUTRAL_MASK, vec, -np.inf)))]
 
     # Enhanced preference for non-neutral emotions
-    ordered = sorted(fused.items(), key=lambda kv: kv[1], reverse=True)
-    top_label, top_score = ordered[0]
+    ordered = np.argsort(-vec, kind="stable")
+    top = int(ordered[0])
 
     # More aggressive non-neutral preference
-    if settings.prefer_non_neutral and top_label == "neutral":
+    if p.prefer_non_neutral and top == NEUTRAL_IDX:
+        # More lenient thresholds for preferring non-neutral
+        min_threshold = max(p.non_neutral_min * 0.5, 0.05)  # Lower threshold
+        max_margin = p.neutral_margin * 1.5  # Larger margin
+        top_score = vec[top]
         # Look at top 3 alternatives instead of just next one
-        for lab, sc in ordered[1:4]:  # Check top 3 alternatives
-            if lab != "neutral":
-                # More lenient thresholds for preferring non-neutral
-                min_threshold = max(settings.non_neutral_min * 0.5, 0.05)  # Lower threshold
-                max_margin = settings.neutral_margin * 1.5  # Larger margin
-
-                if sc >= min_threshold and (top_score - sc) <= max_margin:
-                    return lab
+        for i in ordered[1:4].tolist():
+            sc = vec[i]
+            if sc >= min_threshold and (top_score - sc) <= max_margin:
+                return FACE7_ORDER[i]
 
-    return top_label
+    return FACE7_ORDER[top]
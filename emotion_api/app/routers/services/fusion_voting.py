@@ -9,11 +9,286 @@ Combina detecciones de:
 Usando votación ponderada con pesos dinámicos basados en confianza.
 """
 
+from functools import lru_cache
 from typing import Dict, List, Literal, Optional, Tuple
+import os
 import time
-from collections import defaultdict
+import logging
 import numpy as np
 
+try:
+    from numba import guvectorize, njit
+except ImportError:  # sin numba el núcleo del suavizado corre como Python normal
+    guvectorize = njit = None
+
+
+logger = logging.getLogger(__name__)
+
+# Trazas de depuración de la fusión: se decide al importar (FUSION_DEBUG=1) para que
+# con el flag apagado el camino caliente no evalúe nada; además respeta config['debug_mode']
+_DEBUG = __debug__ and os.environ.get('FUSION_DEBUG') == '1'
+
+# Todas las emociones posibles (orden fijo: índice de los vectores de 7)
+ALL_EMOTIONS = ['angry', 'disgusted', 'fearful', 'happy', 'neutral', 'sad', 'surprised']
+_EMOTION_INDEX = {e: i for i, e in enumerate(ALL_EMOTIONS)}
+# Etiquetas como arreglo, compartido por todas las salas (indexable con máscaras)
+_ALL_EMOTIONS_ARR = np.array(ALL_EMOTIONS)
+_NEUTRAL_I = _EMOTION_INDEX['neutral']
+
+# Mapeo de emociones a formato estándar
+EMOTION_MAPPING = {
+    'anger': 'angry',
+    'angry': 'angry',
+    'disgust': 'disgusted',
+    'disgusted': 'disgusted',
+    'fear': 'fearful',
+    'fearful': 'fearful',
+    'happy': 'happy',
+    'neutral': 'neutral',
+    'sad': 'sad',
+    'surprise': 'surprised',
+    'surprised': 'surprised'
+}
+
+
+@lru_cache(maxsize=64)
+def _normalize_emotion(emotion: str) -> str:
+    """Normaliza nombre de emoción a formato estándar (el universo de etiquetas es chico)"""
+    lab = emotion.lower()
+    return EMOTION_MAPPING.get(lab, lab)
+
+
+# Scores recientes que guarda EmotionEMA por emoción (= max_history_size de la fusión)
+EMA_WINDOW = 8
+# dtype del estado por sala de EmotionEMA: confianzas 0-1, float32 sobra
+_STATE_DTYPE = np.float32
+
+
+# ---------------------------------------------------------------------------
+# Núcleo numérico del suavizado temporal (ver _smooth_with_history)
+# ---------------------------------------------------------------------------
+# Códigos que devuelve _smooth_kernel
+_SMOOTH_INSUFFICIENT = 0
+_SMOOTH_REJECT_FAST = 1
+_SMOOTH_REJECT_LOW_CONF = 2
+_SMOOTH_STRONG = 3
+_SMOOTH_CONSISTENT = 4
+_SMOOTH_OUTLIER = 5
+_SMOOTH_REJECT_OUTLIER = 6
+_SMOOTH_SUDDEN = 7
+_SMOOTH_NORMAL = 8
+
+# Códigos int8 del historial: 0..6 son ALL_EMOTIONS; las etiquetas fuera de ellas
+# (p.ej. 'calm' si ambas modalidades coinciden en ella) usan _N_EMOTIONS + i,
+# con i su posición en la tabla propia de cada sala (_RoomHistory.labels)
+_N_EMOTIONS = len(ALL_EMOTIONS)
+
+
+def _smooth_kernel(emo, ts, head, size, run, cur_e, cur_conf, cur_ts, params):
+    """
+    Decide el ajuste temporal a partir del ring buffer de la sala (ver _RoomHistory).
+    Devuelve (código _SMOOTH_*, factor sobre la confianza actual).
+
+    run: largo de la racha final de la última emoción (_RoomHistory.run)
+
+    params: [min_history, min_duration, allow_neutral, neutral_idx, min_conf_change,
+             weak_outlier_reject, strong_boost, consistency_boost, outlier_penalty,
+             sudden_change_penalty]
+    """
+    if size == 0 or size < params[0]:
+        return _SMOOTH_INSUFFICIENT, 1.0
+
+    cap = emo.shape[0]
+    last = (head - 1 + cap) % cap
+    is_change = cur_e != emo[last]
+
+    # FILTRO 1: mínimo tiempo de emoción (salvo cambio a neutral si está permitido)
+    if is_change and cur_ts - ts[last] < params[1]:
+        if not (params[2] != 0.0 and cur_e == params[3]):
+            return _SMOOTH_REJECT_FAST, 1.0
+
+    # FILTRO 2: confianza mínima para cambiar
+    if is_change and cur_conf < params[4]:
+        return _SMOOTH_REJECT_LOW_CONF, 1.0
+
+    # Cuántas de las últimas coinciden seguidas con la actual: la racha ya está contada
+    if not is_change:
+        if run >= 4:
+            return _SMOOTH_STRONG, params[6]
+        if run >= 2:
+            return _SMOOTH_CONSISTENT, params[7]
+
+    # Outlier: distinta a las últimas 3 (si la última ya es distinta y su racha
+    # cubre las 3, no hace falta mirar más atrás)
+    if size >= 3 and is_change:
+        outlier = True
+        if run < 3:
+            for j in range(run, 3):
+                if emo[(head - 1 - j + cap) % cap] == cur_e:
+                    outlier = False
+        if outlier:
+            if params[5] != 0.0 and cur_conf * params[8] < 0.50:
+                return _SMOOTH_REJECT_OUTLIER, params[8]
+            return _SMOOTH_OUTLIER, params[8]
+
+    if is_change:
+        return _SMOOTH_SUDDEN, params[9]
+    return _SMOOTH_NORMAL, 1.0
+
+
+if njit is not None:
+    # Firma explícita: se compila al importar, no en la primera fusión
+    _smooth_core = njit("Tuple((int64, float64))(int8[::1], float64[::1], int64, int64, int64, int64, "
+                        "float64, float64, float64[::1])", cache=True)(_smooth_kernel)
+else:
+    _smooth_core = _smooth_kernel
+
+
+# Valores posibles de 'adjustment' guardados en el historial (int8; -1 = sin la clave)
+_ADJUSTMENTS = ('none', 'strong_consistency_boost', 'consistency_boost', 'outlier_penalty', 'sudden_change')
+_ADJUSTMENT_CODES = {a: i for i, a in enumerate(_ADJUSTMENTS)}
+
+# 'temporal' compacto cuando debug_mode está apagado: dicts compartidos, de solo lectura
+_TEMPORAL_REJECT_FAST = {'adjustment': 'rejected', 'reason': 'change_too_fast'}
+_TEMPORAL_REJECT_LOW_CONF = {'adjustment': 'rejected', 'reason': 'low_confidence_for_change'}
+_TEMPORAL_REJECT_OUTLIER = {'adjustment': 'rejected', 'reason': 'weak_outlier'}
+_TEMPORAL_STRONG = {'adjustment': 'strong_consistency_boost', 'reason': 'emotion_very_consistent_last_4'}
+_TEMPORAL_CONSISTENT = {'adjustment': 'consistency_boost', 'reason': 'emotion_consistent_with_last_2'}
+_TEMPORAL_OUTLIER = {'adjustment': 'outlier_penalty', 'reason': 'emotion_differs_from_last_3'}
+_TEMPORAL_SUDDEN = {'adjustment': 'sudden_change', 'reason': 'emotion_changed_from_previous'}
+_TEMPORAL_NORMAL = {'adjustment': 'none', 'reason': 'normal_progression'}
+
+
+class _RoomHistory:
+    """
+    Historial de fusiones de una sala como ring buffer SoA: arreglos NumPy
+    preasignados + puntero de escritura, sin un dict por fusión.
+
+    Para lectura (endpoint /history, debug) se itera como antes: dicts
+    {'emotion', 'confidence', 'timestamp'[, 'adjustment']} del más viejo al más nuevo.
+    """
+    __slots__ = ('emo', 'conf', 'ts', 'adj', 'head', 'size', 'run', 'labels')
+
+    def __init__(self, capacity: int = 8):
+        self.emo = np.zeros(capacity, dtype=np.int8)      # código de emoción (code())
+        self.conf = np.zeros(capacity, dtype=np.float64)
+        self.ts = np.zeros(capacity, dtype=np.float64)
+        self.adj = np.full(capacity, -1, dtype=np.int8)   # índice en _ADJUSTMENTS
+        self.head = 0  # próxima posición a escribir
+        self.size = 0
+        self.run = 0   # cuántas de las últimas fusiones seguidas tienen la última emoción
+        self.labels = []  # etiquetas fuera de ALL_EMOTIONS (código _N_EMOTIONS + i)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def code(self, emotion: str) -> int:
+        """
+        Código int8 de `emotion`. Una etiqueta nueva fuera de ALL_EMOTIONS reusa la
+        entrada de self.labels que ya no aparece en el ring; así la tabla nunca pasa
+        de capacity + 1 etiquetas y el código cabe en int8.
+        """
+        code = _EMOTION_INDEX.get(emotion)
+        if code is not None:
+            return code
+        labels = self.labels
+        if emotion in labels:
+            return _N_EMOTIONS + labels.index(emotion)
+        live = set(self.emo[self._slot(j)] for j in range(self.size))
+        for i in range(len(labels)):
+            if _N_EMOTIONS + i not in live:
+                labels[i] = emotion
+                return _N_EMOTIONS + i
+        labels.append(emotion)
+        return _N_EMOTIONS + len(labels) - 1
+
+    def label(self, code: int) -> str:
+        return ALL_EMOTIONS[code] if code < _N_EMOTIONS else self.labels[code - _N_EMOTIONS]
+
+    def append(self, emotion: str, confidence: float, timestamp: float, adjustment: Optional[str] = None) -> None:
+        """Agrega una fusión; al llenarse pisa la más antigua"""
+        i = self.head
+        code = self.code(emotion)
+        cap = self.emo.shape[0]
+        # Racha final: se extiende si repite la última emoción (nunca más que lo guardado)
+        if self.size and self.emo[(i - 1) % cap] == code:
+            self.run = min(self.run + 1, cap)
+        else:
+            self.run = 1
+        self.emo[i] = code
+        self.conf[i] = confidence
+        self.ts[i] = timestamp
+        self.adj[i] = -1 if adjustment is None else _ADJUSTMENT_CODES[adjustment]
+        self.head = (i + 1) % cap
+        self.size = min(self.size + 1, cap)
+
+    def _slot(self, k: int) -> int:
+        """Posición de la k-ésima fusión más reciente (0 = última)"""
+        return (self.head - 1 - k) % self.emo.shape[0]
+
+    def last_emotion(self) -> str:
+        return self.label(self.emo[self._slot(0)])
+
+    def last_confidence(self) -> float:
+        return float(self.conf[self._slot(0)])
+
+    def last_timestamp(self) -> float:
+        return float(self.ts[self._slot(0)])
+
+    def recent_emotions(self, k: int) -> List[str]:
+        """Últimas k emociones, de la más vieja a la más nueva"""
+        return [self.label(self.emo[self._slot(j)]) for j in range(min(k, self.size) - 1, -1, -1)]
+
+    def __iter__(self):
+        for j in range(self.size - 1, -1, -1):
+            i = self._slot(j)
+            entry = {
+                'emotion': self.label(self.emo[i]),
+                'confidence': float(self.conf[i]),
+                'timestamp': float(self.ts[i]),
+            }
+            if self.adj[i] >= 0:
+                entry['adjustment'] = _ADJUSTMENTS[self.adj[i]]
+            yield entry
+
+
+def _ema_step_kernel(ema, x, present, seen, alpha):
+    """
+    Paso del EMA y emoción dominante en una sola pasada sobre el vector de 7.
+
+    Actualiza ema/seen in-place (solo las emociones presentes; una emoción nueva
+    arranca en su score) y retorna (índice dominante entre las vistas, su EMA);
+    índice -1 si todavía no hay ninguna.
+    """
+    one_m = 1.0 - alpha
+    best_i = -1
+    best_v = -np.inf
+    for i in range(ema.shape[0]):
+        if present[i]:
+            if seen[i]:
+                ema[i] = alpha * x[i] + one_m * ema[i]
+            else:
+                ema[i] = x[i]
+                seen[i] = True
+        if seen[i] and ema[i] > best_v:
+            best_v = ema[i]
+            best_i = i
+    return best_i, best_v
+
+
+if njit is not None:
+    _ema_step = njit("Tuple((int64, float64))(float32[::1], float32[::1], boolean[::1], "
+                     "boolean[::1], float64)", cache=True)(_ema_step_kernel)
+else:
+    def _ema_step(ema, x, present, seen, alpha):
+        # Sin numba: la misma actualización con operaciones vectoriales
+        np.copyto(ema, np.where(seen, alpha * x + (1.0 - alpha) * ema, x), where=present)
+        seen |= present
+        if not seen.any():
+            return -1, -np.inf
+        best_i = int(np.where(seen, ema, -np.inf).argmax())
+        return best_i, float(ema[best_i])
+
 
 class EmotionEMA:
     """
@@ -31,6 +306,9 @@ class EmotionEMA:
     - alpha = 0.5 → Balanceado (50/50)
     - alpha = 0.7 → Reactivo (30% historial, 70% nuevo)
     """
+    __slots__ = ('alpha', 'one_minus_alpha', '_ema', '_seen',
+                 '_window', '_wlen', '_whead', '_weights_cache', '_dominant', 'initialized')
+
     def __init__(self, alpha: float = 0.3):
         """
         Args:
@@ -38,9 +316,26 @@ class EmotionEMA:
                    Menor = más suave, Mayor = más reactivo
         """
         self.alpha = alpha
-        self.ema_scores = {}  # {emotion: ema_score}
+        self.one_minus_alpha = 1.0 - alpha
+        # Estado como vector fijo sobre ALL_EMOTIONS; _seen marca las emociones
+        # que ya tienen EMA (las demás no aparecen en ema_scores)
+        self._ema = np.zeros(len(ALL_EMOTIONS), dtype=_STATE_DTYPE)
+        self._seen = np.zeros(len(ALL_EMOTIONS), dtype=bool)
+        # Últimos EMA_WINDOW scores de cada emoción (un ring por renglón), para
+        # reconstruir el EMA en resync(); _wlen/_whead: llenado y próxima posición
+        self._window = np.zeros((len(ALL_EMOTIONS), EMA_WINDOW), dtype=_STATE_DTYPE)
+        self._wlen = np.zeros(len(ALL_EMOTIONS), dtype=np.int8)
+        self._whead = np.zeros(len(ALL_EMOTIONS), dtype=np.int8)
+        self._weights_cache: Dict[int, np.ndarray] = {}
+        # Índice dominante que deja update() (-1 = ninguna vista; None = recalcular)
+        self._dominant: Optional[int] = -1
         self.initialized = False
 
+    @property
+    def ema_scores(self) -> Dict[str, float]:
+        """{emotion: ema_score}; el dict se arma solo cuando se pide"""
+        return dict(zip(_ALL_EMOTIONS_ARR[self._seen].tolist(), self._ema[self._seen].tolist()))
+
     def update(self, emotion_scores: Dict[str, float]) -> Dict[str, float]:
         """
         Actualiza EMA con nuevos scores
@@ -48,42 +343,98 @@ class EmotionEMA:
         Formula: EMA_new = α * score_current + (1-α) * EMA_previous
 
         Args:
-            emotion_scores: {emotion: confidence} actual
+            emotion_scores: {emotion: confidence} actual (emociones de ALL_EMOTIONS)
 
         Returns:
             {emotion: ema_confidence} suavizado
         """
-        if not self.initialized:
-            # Primera vez: inicializar con valores actuales
-            self.ema_scores = emotion_scores.copy()
-            self.initialized = True
-            return self.ema_scores
-
-        # Aplicar EMA a cada emoción
+        x = np.zeros(len(ALL_EMOTIONS), dtype=_STATE_DTYPE)
+        present = np.zeros(len(ALL_EMOTIONS), dtype=bool)
+        idx = _EMOTION_INDEX
         for emotion, score in emotion_scores.items():
-            if emotion not in self.ema_scores:
-                # Nueva emoción: inicializar
-                self.ema_scores[emotion] = score
-            else:
-                # Aplicar EMA
-                self.ema_scores[emotion] = (
-                    self.alpha * score +
-                    (1 - self.alpha) * self.ema_scores[emotion]
-                )
+            i = idx.get(emotion)
+            if i is not None:
+                x[i] = score
+                present[i] = True
+
+        # Ventanas: escribir el score de cada emoción presente en su ring
+        rows = np.flatnonzero(present)
+        self._window[rows, self._whead[rows]] = x[rows]
+        self._whead[rows] = (self._whead[rows] + 1) % EMA_WINDOW
+        self._wlen[rows] = np.minimum(self._wlen[rows] + 1, EMA_WINDOW)
+
+        # Emoción nueva: se inicializa con su score; las ausentes conservan su EMA.
+        # El mismo paso deja calculada la emoción dominante.
+        self._dominant, _ = _ema_step(self._ema, x, present, self._seen, self.alpha)
+        self.initialized = True
+
+        return self.ema_scores
+
+    def _weights(self, n: int) -> np.ndarray:
+        """
+        Pesos de la forma cerrada del EMA sobre n scores (el primero inicializa):
+        [(1-α)^(n-1), α(1-α)^(n-2), ..., α]
+        """
+        w = self._weights_cache.get(n)
+        if w is None:
+            w = self.one_minus_alpha ** np.arange(n - 1, -1, -1, dtype=np.float64)
+            w[1:] *= self.alpha
+            self._weights_cache[n] = w
+        return w
+
+    def resync(self, alpha: Optional[float] = None) -> Dict[str, float]:
+        """
+        Reconstruye el EMA desde la ventana de scores guardada (un np.dot por emoción)
+
+        Útil para cambiar alpha en caliente sin esperar a que el EMA converja.
+        Con más de EMA_WINDOW updates el score más viejo de la ventana hace de valor inicial.
+
+        Args:
+            alpha: Nuevo factor de suavizado (None = mantener el actual)
+        """
+        if alpha is not None and alpha != self.alpha:
+            self.alpha = alpha
+            self.one_minus_alpha = 1.0 - alpha
+            self._weights_cache.clear()
+
+        for i in np.flatnonzero(self._wlen).tolist():
+            n = int(self._wlen[i])
+            order = (self._whead[i] - n + np.arange(n)) % EMA_WINDOW  # del más viejo al más nuevo
+            self._ema[i] = np.dot(self._weights(n), self._window[i, order])
+        self._dominant = None
 
         return self.ema_scores
 
     def get_dominant_emotion(self) -> Tuple[str, float]:
         """Retorna la emoción con mayor EMA"""
-        if not self.ema_scores:
+        i = self._dominant
+        if i is None:
+            i = int(np.where(self._seen, self._ema, -np.inf).argmax()) if self._seen.any() else -1
+            self._dominant = i
+        if i < 0:
             return 'neutral', 0.5
 
-        dominant = max(self.ema_scores.items(), key=lambda x: x[1])
-        return dominant[0], dominant[1]
+        return ALL_EMOTIONS[i], float(self._ema[i])
+
+    def get_top_k(self, k: int) -> List[Tuple[str, float]]:
+        """Las k emociones con mayor EMA, de mayor a menor"""
+        k = min(k, int(self._seen.sum()))
+        if k <= 0:
+            return []
+
+        vals = np.where(self._seen, self._ema, -np.inf)
+        idx = np.argpartition(-vals, k - 1)[:k]
+        idx = idx[np.argsort(-vals[idx], kind='stable')]
+        return [(ALL_EMOTIONS[i], float(self._ema[i])) for i in idx.tolist()]
 
     def reset(self):
         """Resetea el EMA"""
-        self.ema_scores = {}
+        self._ema.fill(0.0)
+        self._seen.fill(False)
+        self._window.fill(0.0)
+        self._wlen.fill(0)
+        self._whead.fill(0)
+        self._dominant = -1
         self.initialized = False
 
 
@@ -106,6 +457,9 @@ class EmotionPersistence:
         t=10s: neutral (0.30) → usar happy (0.61 con decay)
         t=20s: neutral (0.30) → finalmente neutral (0.30)
     """
+    __slots__ = ('strong_threshold', 'weak_threshold', 'decay_rate', 'min_persistence',
+                 'last_strong_emotion', 'last_strong_confidence', 'last_strong_timestamp')
+
     def __init__(
         self,
         strong_threshold: float = 0.70,
@@ -127,20 +481,21 @@ class EmotionPersistence:
 
         self.last_strong_emotion = 'neutral'
         self.last_strong_confidence = 0.5
-        self.last_strong_timestamp = time.time()
+        self.last_strong_timestamp = time.monotonic()
 
-    def update(self, emotion: str, confidence: float) -> Tuple[str, float, bool]:
+    def update(self, emotion: str, confidence: float, now: Optional[float] = None) -> Tuple[str, float, bool]:
         """
         Actualiza persistencia y retorna emoción a usar
 
         Args:
             emotion: Emoción detectada actualmente
             confidence: Confianza de la detección actual
+            now: Tick de time.monotonic() ya medido por el llamador (opcional)
 
         Returns:
             (emotion_to_use, confidence_to_use, used_persistence)
         """
-        current_time = time.time()
+        current_time = time.monotonic() if now is None else now
 
         # Si la detección actual es fuerte, guardarla
         if confidence >= self.strong_threshold:
@@ -149,16 +504,13 @@ class EmotionPersistence:
             self.last_strong_timestamp = current_time
             return emotion, confidence, False  # No usó persistencia
 
-        # Si la detección actual es débil, considerar usar persistencia
-        if confidence < self.weak_threshold:
-            # Calcular confianza con decay
-            decayed_confidence = self.last_strong_confidence * self.decay_rate
-
-            # Solo usar persistencia si la emoción decayada sigue siendo válida
-            if decayed_confidence >= self.min_persistence:
-                # Aplicar decay
-                self.last_strong_confidence = decayed_confidence
-                return self.last_strong_emotion, decayed_confidence, True  # Usó persistencia
+        # Detección débil: usar persistencia solo si la emoción decayada sigue siendo válida
+        # (el decay se calcula siempre; es una multiplicación y evita anidar condiciones)
+        decayed_confidence = self.last_strong_confidence * self.decay_rate
+        if confidence < self.weak_threshold and decayed_confidence >= self.min_persistence:
+            # Aplicar decay
+            self.last_strong_confidence = decayed_confidence
+            return self.last_strong_emotion, decayed_confidence, True  # Usó persistencia
 
         # Caso normal: usar detección actual
         return emotion, confidence, False
@@ -167,7 +519,46 @@ class EmotionPersistence:
         """Resetea la persistencia"""
         self.last_strong_emotion = 'neutral'
         self.last_strong_confidence = 0.5
-        self.last_strong_timestamp = time.time()
+        self.last_strong_timestamp = time.monotonic()
+
+
+def _fuse_rows(f, a, wf, wa, out):
+    """out = wf*f + wa*a para una sala (un renglón de 7)"""
+    for i in range(f.shape[0]):
+        out[i] = wf * f[i] + wa * a[i]
+
+
+if guvectorize is not None:
+    # Un renglón por sala; con varios núcleos numba reparte los renglones entre hilos
+    _fuse_rows_gu = guvectorize(
+        ["void(float64[:], float64[:], float64, float64, float64[:])"],
+        "(n),(n),(),()->(n)",
+        target="parallel" if (os.cpu_count() or 1) > 1 else "cpu",
+    )(_fuse_rows)
+else:
+    _fuse_rows_gu = None
+
+
+def fuse_batch(face_vecs: np.ndarray, audio_vecs: np.ndarray,
+               w_face: np.ndarray, w_audio: np.ndarray) -> np.ndarray:
+    """
+    Fusión ponderada de varias salas a la vez (mismo cálculo que _weighted_fusion)
+
+    Args:
+        face_vecs, audio_vecs: (B, 7) distribuciones sobre ALL_EMOTIONS
+            (p.ej. de _extract_scores_vec)
+        w_face, w_audio: (B,) pesos de cada sala
+
+    Returns:
+        (B, 7) scores fusionados; la mejor emoción es fused.argmax(axis=1)
+    """
+    face_vecs = np.ascontiguousarray(face_vecs, dtype=np.float64)
+    audio_vecs = np.ascontiguousarray(audio_vecs, dtype=np.float64)
+    w_face = np.asarray(w_face, dtype=np.float64)
+    w_audio = np.asarray(w_audio, dtype=np.float64)
+    if _fuse_rows_gu is not None:
+        return _fuse_rows_gu(face_vecs, audio_vecs, w_face, w_audio)
+    return w_face[:, None] * face_vecs + w_audio[:, None] * audio_vecs
 
 
 class ConfidenceBasedVotingFusion:
@@ -176,22 +567,20 @@ class ConfidenceBasedVotingFusion:
     """
 
     # Mapeo de emociones a formato estándar
-    EMOTION_MAPPING = {
-        'anger': 'angry',
-        'angry': 'angry',
-        'disgust': 'disgusted',
-        'disgusted': 'disgusted',
-        'fear': 'fearful',
-        'fearful': 'fearful',
-        'happy': 'happy',
-        'neutral': 'neutral',
-        'sad': 'sad',
-        'surprise': 'surprised',
-        'surprised': 'surprised'
-    }
+    EMOTION_MAPPING = EMOTION_MAPPING
 
     # Todas las emociones posibles
-    ALL_EMOTIONS = ['angry', 'disgusted', 'fearful', 'happy', 'neutral', 'sad', 'surprised']
+    ALL_EMOTIONS = ALL_EMOTIONS
+
+    __slots__ = (
+        'config', 'temporal_config', 'ema_systems', 'persistence_systems',
+        'fusion_history', 'max_history_size',
+        '_config_version', '_history_version', '_smooth_params_version', '_smooth_params_arr',
+        # Copias de config como atributos (ver _sync_config)
+        '_min_conf', '_weight_mode', '_base_face', '_base_audio', '_min_w', '_max_w',
+        '_boost_consensus', '_consensus_boost', '_penalize_conflict', '_conflict_penalty',
+        '_suppress_neutral', '_neutral_threshold', '_neutral_min_gap', '_debug_mode',
+    )
 
     def __init__(self, config: Optional[Dict] = None):
         """
@@ -201,6 +590,11 @@ class ConfidenceBasedVotingFusion:
             config: Diccionario de configuración (si es None, usa valores por defecto)
         """
         self.config = config or self._default_config()
+        self._sync_config()
+        # Versiones para ETag de los GET del router: config/temporal_config y historial
+        self._config_version = 0
+        self._history_version = 0
+        self._smooth_params_version = -1  # fuerza armar _smooth_params() en el primer uso
 
         # ===================================================================
         # NUEVO: EMA (Exponential Moving Average) por sala
@@ -223,7 +617,7 @@ class ConfidenceBasedVotingFusion:
         # - Outliers → RECHAZO o penalización muy fuerte
         # - Emociones dominantes → mantener por mínimo tiempo
         #
-        # Estructura: {"room_id": [fusion1, fusion2, ...]}
+        # Estructura: {"room_id": _RoomHistory} (ring buffer de max_history_size)
         self.fusion_history = {}
         self.max_history_size = 8  # Últimas 8 fusiones (aumentado de 5)
         self.temporal_config = {
@@ -253,6 +647,24 @@ class ConfidenceBasedVotingFusion:
             'min_confidence_for_change': 0.42, # Confianza mínima para aceptar cambio de emoción (ANTES: 0.50)
         }
 
+    def _sync_config(self) -> None:
+        """Copia a atributos los valores de config que se leen en cada fusión"""
+        cfg = self.config
+        self._min_conf = cfg['min_confidence']
+        self._weight_mode = cfg['weight_adjustment_mode']
+        self._base_face = cfg['base_face_weight']
+        self._base_audio = cfg['base_audio_weight']
+        self._min_w = cfg['min_weight']
+        self._max_w = cfg['max_weight']
+        self._boost_consensus = cfg['boost_consensus']
+        self._consensus_boost = cfg['consensus_boost']
+        self._penalize_conflict = cfg['penalize_conflict']
+        self._conflict_penalty = cfg['conflict_penalty']
+        self._suppress_neutral = cfg['suppress_neutral']
+        self._neutral_threshold = cfg['neutral_threshold']
+        self._neutral_min_gap = cfg['neutral_min_gap']
+        self._debug_mode = cfg['debug_mode']
+
     def _default_config(self) -> Dict:
         """Configuración por defecto"""
         return {
@@ -286,7 +698,8 @@ class ConfidenceBasedVotingFusion:
             'debug_mode': True,
         }
 
-    def fuse(self, face_result: Dict, audio_result: Dict, room: str = "default") -> Dict:
+    def fuse(self, face_result: Dict, audio_result: Dict, room: str = "default",
+             now: Optional[float] = None) -> Dict:
         """
         Fusión principal de emociones CON SUAVIZADO TEMPORAL
 
@@ -294,6 +707,8 @@ class ConfidenceBasedVotingFusion:
             face_result: {"label": str, "score": float, "scores": [...]}
             audio_result: {"label": str, "score": float, "scores": [...]}
             room: ID de sala para tracking de historial
+            now: Tick de time.monotonic() ya medido por el llamador; si no se pasa
+                 se lee una sola vez aquí y se reutiliza en suavizado y persistencia
 
         Returns:
             {
@@ -307,19 +722,22 @@ class ConfidenceBasedVotingFusion:
                 "temporal": {...}  # Info de suavizado temporal
             }
         """
-        start_time = time.time()
+        start_time = time.monotonic()
+        if now is None:
+            now = start_time
 
         # 1. Extraer y normalizar datos
-        face_emotion = self._normalize_emotion(face_result.get('label', 'neutral'))
+        face_emotion = _normalize_emotion(face_result.get('label', 'neutral'))
         face_conf = float(face_result.get('score', 0.0))
-        audio_emotion = self._normalize_emotion(audio_result.get('label', 'neutral'))
+        audio_emotion = _normalize_emotion(audio_result.get('label', 'neutral'))
         audio_conf = float(audio_result.get('score', 0.0))
 
-        if self.config['debug_mode']:
-            print(f"[FUSION] Input -> Face: {face_emotion} ({face_conf:.2f}), Audio: {audio_emotion} ({audio_conf:.2f})")
+        if _DEBUG and self._debug_mode:
+            logger.debug("[FUSION] Input -> Face: %s (%.2f), Audio: %s (%.2f)",
+                         face_emotion, face_conf, audio_emotion, audio_conf)
 
         # 2. Validar confianzas mínimas
-        min_conf = self.config['min_confidence']
+        min_conf = self._min_conf
         face_valid = face_conf >= min_conf
         audio_valid = audio_conf >= min_conf
 
@@ -338,11 +756,19 @@ class ConfidenceBasedVotingFusion:
 
         # 5. Consenso vs Conflicto
         if face_emotion == audio_emotion:
-            # CONSENSO: ambas modalidades coinciden
-            raw_result = self._consensus_weighted(
+            # CONSENSO (camino más común): solo aritmética escalar, sin distribuciones
+            avg_conf, final_conf = self._fuse_consensus_fast(
+                face_conf, audio_conf, w_face, w_audio,
+                self._consensus_boost if self._boost_consensus else None
+            )
+            raw_result = self._build_result(
+                face_emotion, final_conf, 'consensus_weighted', w_face, w_audio,
                 face_result, audio_result,
-                face_emotion, face_conf, audio_conf,
-                w_face, w_audio
+                {
+                    'avg_confidence_before_boost': round(avg_conf, 4),
+                    'boost_applied': self._boost_consensus,
+                    'both_agree': True
+                }
             )
         else:
             # CONFLICTO: modalidades no coinciden
@@ -358,31 +784,30 @@ class ConfidenceBasedVotingFusion:
         # - Evitar cambios bruscos irreales
         # - Boost emociones consistentes
         # - Filtrar outliers (ruido)
-        result = self._smooth_with_history(raw_result, room)
+        result = self._smooth_with_history(raw_result, room, now)
 
         # ===================================================================
         # 7. PERSISTENCIA EMOCIONAL (NUEVA MEJORA)
         # ===================================================================
         # Evita caer a neutral cuando la confianza baja temporalmente
         if self.temporal_config.get('enable_persistence', True):
-            result = self._apply_persistence(result, room)
+            result = self._apply_persistence(result, room, now)
+
+        self._history_version += 1
 
         # Agregar tiempo de procesamiento
-        result['processing_time_ms'] = round((time.time() - start_time) * 1000, 2)
+        result['processing_time_ms'] = round((time.monotonic() - start_time) * 1000, 2)
 
-        if self.config['debug_mode']:
+        if _DEBUG and self._debug_mode:
             temporal_info = result.get('temporal', {})
-            temporal_flag = f" [{temporal_info.get('adjustment', 'none')}]" if temporal_info else ""
-            persistence_info = result.get('persistence', {})
-            persistence_flag = " [PERSIST]" if persistence_info.get('used', False) else ""
-            print(f"[FUSION] Output -> {result['emotion']} ({result['confidence']:.2f}) via {result['strategy']}{temporal_flag}{persistence_flag} in {result['processing_time_ms']}ms")
+            temporal_flag = " [%s]" % temporal_info.get('adjustment', 'none') if temporal_info else ""
+            persistence_flag = " [PERSIST]" if result.get('persistence', {}).get('used', False) else ""
+            logger.debug("[FUSION] Output -> %s (%.2f) via %s%s%s in %sms",
+                         result['emotion'], result['confidence'], result['strategy'],
+                         temporal_flag, persistence_flag, result['processing_time_ms'])
 
         return result
 
-    def _normalize_emotion(self, emotion: str) -> str:
-        """Normaliza nombre de emoción a formato estándar"""
-        return self.EMOTION_MAPPING.get(emotion.lower(), emotion.lower())
-
     def _calculate_dynamic_weights(self, face_conf: float, audio_conf: float) -> Tuple[float, float]:
         """
         Calcula pesos dinámicos según modo configurado
@@ -390,7 +815,7 @@ class ConfidenceBasedVotingFusion:
         Returns:
             (w_face, w_audio) normalizados que suman 1.0
         """
-        mode = self.config['weight_adjustment_mode']
+        mode = self._weight_mode
 
         if mode == 'threshold':
             return self._adjust_weights_threshold(face_conf, audio_conf)
@@ -428,17 +853,8 @@ class ConfidenceBasedVotingFusion:
         if diff < 0:  # audio tiene más confianza
             adjustment = -adjustment
 
-        # Aplicar ajuste a los pesos base
-        w_face = self.config['base_face_weight'] + adjustment
-        w_audio = self.config['base_audio_weight'] - adjustment
-
-        # Clamp entre límites
-        w_face = max(self.config['min_weight'], min(self.config['max_weight'], w_face))
-        w_audio = max(self.config['min_weight'], min(self.config['max_weight'], w_audio))
-
-        # Normalizar para que sumen 1.0
-        total = w_face + w_audio
-        return w_face / total, w_audio / total
+        # Aplicar ajuste a los pesos base, clamp entre límites y normalizar
+        return self._clamp_normalize(adjustment)
 
     def _adjust_weights_linear(self, face_conf: float, audio_conf: float) -> Tuple[float, float]:
         """Ajuste lineal proporcional"""
@@ -446,14 +862,7 @@ class ConfidenceBasedVotingFusion:
         # Ajuste proporcional a la diferencia (máximo ±0.15)
         adjustment = max(-0.15, min(0.15, diff * 0.3))
 
-        w_face = self.config['base_face_weight'] + adjustment
-        w_audio = self.config['base_audio_weight'] - adjustment
-
-        w_face = max(self.config['min_weight'], min(self.config['max_weight'], w_face))
-        w_audio = max(self.config['min_weight'], min(self.config['max_weight'], w_audio))
-
-        total = w_face + w_audio
-        return w_face / total, w_audio / total
+        return self._clamp_normalize(adjustment)
 
     def _adjust_weights_exponential(self, face_conf: float, audio_conf: float) -> Tuple[float, float]:
         """Ajuste exponencial (énfasis en diferencias grandes)"""
@@ -462,52 +871,39 @@ class ConfidenceBasedVotingFusion:
         adjustment = (abs(diff) ** 1.5) * 0.2 * (1 if diff > 0 else -1)
         adjustment = max(-0.15, min(0.15, adjustment))
 
-        w_face = self.config['base_face_weight'] + adjustment
-        w_audio = self.config['base_audio_weight'] - adjustment
+        return self._clamp_normalize(adjustment)
 
-        w_face = max(self.config['min_weight'], min(self.config['max_weight'], w_face))
-        w_audio = max(self.config['min_weight'], min(self.config['max_weight'], w_audio))
-
-        total = w_face + w_audio
-        return w_face / total, w_audio / total
+    def _clamp_normalize(self, adjustment: float) -> Tuple[float, float]:
+        """
+        Pesos base ± ajuste, acotados a [min_weight, max_weight] y normalizados
+        para que sumen 1.0 (un clip + una división sobre el par face/audio)
+        """
+        w = np.array([self._base_face + adjustment, self._base_audio - adjustment])
+        np.clip(w, self._min_w, self._max_w, out=w)
+        w /= w.sum()
+        return float(w[0]), float(w[1])
 
-    def _consensus_weighted(
-        self,
-        face_result: Dict,
-        audio_result: Dict,
-        emotion: str,
+    @staticmethod
+    def _fuse_consensus_fast(
         face_conf: float,
         audio_conf: float,
         w_face: float,
-        w_audio: float
-    ) -> Dict:
+        w_audio: float,
+        boost: Optional[float]
+    ) -> Tuple[float, float]:
         """
-        Estrategia de CONSENSO: ambas modalidades coinciden
+        Confianza de consenso: (promedio ponderado, promedio con boost)
 
-        Aplicar boost a la confianza promedio
+        boost=None desactiva el boost. Nunca toca los vectores de scores:
+        si ambas modalidades coinciden, la distribución completa no cambia la etiqueta.
         """
         # Confianza promedio ponderada
         avg_conf = w_face * face_conf + w_audio * audio_conf
 
         # Aplicar boost si está habilitado
-        if self.config['boost_consensus']:
-            final_conf = min(1.0, avg_conf * self.config['consensus_boost'])
-        else:
-            final_conf = avg_conf
-
-        return {
-            'emotion': emotion,
-            'confidence': round(final_conf, 4),
-            'strategy': 'consensus_weighted',
-            'weights': {'face': round(w_face, 3), 'audio': round(w_audio, 3)},
-            'face': face_result,
-            'audio': audio_result,
-            'debug': {
-                'avg_confidence_before_boost': round(avg_conf, 4),
-                'boost_applied': self.config['boost_consensus'],
-                'both_agree': True
-            }
-        }
+        if boost is not None:
+            return avg_conf, min(1.0, avg_conf * boost)
+        return avg_conf, avg_conf
 
     def _weighted_fusion(
         self,
@@ -528,140 +924,148 @@ class ConfidenceBasedVotingFusion:
             supresión inteligente de neutral, y validación de rangos.
             La complejidad es necesaria para la lógica de fusión y está bien encapsulada.
         """
-        # Intentar obtener distribuciones completas
-        face_scores = self._extract_scores_dict(face_result)
-        audio_scores = self._extract_scores_dict(audio_result)
+        # Distribuciones completas como vectores sobre ALL_EMOTIONS
+        face_scores = self._extract_scores_vec(face_result)
+        audio_scores = self._extract_scores_vec(audio_result)
 
         # Fusión ponderada
-        fused_scores = {}
-        for emotion in self.ALL_EMOTIONS:
-            f_score = face_scores.get(emotion, 0.0)
-            a_score = audio_scores.get(emotion, 0.0)
-            fused_scores[emotion] = w_face * f_score + w_audio * a_score
+        fused = w_face * face_scores + w_audio * audio_scores
 
         # Seleccionar la mejor emoción
-        best_emotion = max(fused_scores, key=fused_scores.get)
-        best_conf = fused_scores[best_emotion]
+        best_i = int(fused.argmax())
+        best_emotion = self.ALL_EMOTIONS[best_i]
+        best_conf = float(fused[best_i])
 
         # Aplicar penalty por conflicto
-        if self.config['penalize_conflict']:
-            final_conf = best_conf * self.config['conflict_penalty']
+        if self._penalize_conflict:
+            final_conf = best_conf * self._conflict_penalty
         else:
             final_conf = best_conf
 
         # Manejo de neutral
-        if self.config['suppress_neutral'] and best_emotion == 'neutral':
+        if self._suppress_neutral and best_emotion == 'neutral':
             # Buscar siguiente mejor emoción no-neutral
-            non_neutral_emotions = {k: v for k, v in fused_scores.items() if k != 'neutral'}
-            if non_neutral_emotions:
-                second_best = max(non_neutral_emotions, key=non_neutral_emotions.get)
-                second_conf = non_neutral_emotions[second_best]
+            non_neutral = fused.copy()
+            non_neutral[_NEUTRAL_I] = -np.inf
+            second_i = int(non_neutral.argmax())
+            second_best = self.ALL_EMOTIONS[second_i]
+            second_conf = float(fused[second_i])
+
+            # Si neutral no domina significativamente, usar la segunda
+            if best_conf < self._neutral_threshold or (best_conf - second_conf) < self._neutral_min_gap:
+                best_emotion = second_best
+                final_conf = second_conf * self._conflict_penalty if self._penalize_conflict else second_conf
+
+        debug = {
+            'penalty_applied': self._penalize_conflict,
+            'confidence_before_penalty': round(best_conf, 4),
+            'both_agree': False
+        }
+        if self._debug_mode:
+            debug['fused_scores'] = dict(zip(self.ALL_EMOTIONS, np.round(fused, 4).tolist()))
 
-                # Si neutral no domina significativamente, usar la segunda
-                if best_conf < self.config['neutral_threshold'] or (best_conf - second_conf) < self.config['neutral_min_gap']:
-                    best_emotion = second_best
-                    final_conf = second_conf * self.config['conflict_penalty'] if self.config['penalize_conflict'] else second_conf
+        return self._build_result(
+            best_emotion, max(0.0, min(1.0, final_conf)), 'weighted_fusion', w_face, w_audio,
+            face_result, audio_result, debug
+        )
 
+    @staticmethod
+    def _build_result(
+        emotion: str,
+        confidence: float,
+        strategy: str,
+        w_face: float,
+        w_audio: float,
+        face_result: Optional[Dict],
+        audio_result: Optional[Dict],
+        debug: Dict
+    ) -> Dict:
+        """Arma el dict de resultado; único lugar donde se redondean confianza y pesos"""
         return {
-            'emotion': best_emotion,
-            'confidence': round(max(0.0, min(1.0, final_conf)), 4),
-            'strategy': 'weighted_fusion',
+            'emotion': emotion,
+            'confidence': round(confidence, 4),
+            'strategy': strategy,
             'weights': {'face': round(w_face, 3), 'audio': round(w_audio, 3)},
             'face': face_result,
             'audio': audio_result,
-            'debug': {
-                'fused_scores': {k: round(v, 4) for k, v in fused_scores.items()},
-                'penalty_applied': self.config['penalize_conflict'],
-                'confidence_before_penalty': round(best_conf, 4),
-                'both_agree': False
-            }
+            'debug': debug
         }
 
-    def _extract_scores_dict(self, result: Dict) -> Dict[str, float]:
+    def _extract_scores_vec(self, result: Dict) -> np.ndarray:
         """
-        Extrae distribución de scores de un resultado
+        Extrae distribución de scores de un resultado como vector sobre ALL_EMOTIONS
 
         Formatos soportados:
         - {"label": "happy", "score": 0.85, "scores": [{"label": "happy", "score": 0.85}, ...]}
         - {"label": "happy", "score": 0.85}
         """
-        scores_dict = {}
+        vec = np.zeros(len(self.ALL_EMOTIONS))
+        idx = _EMOTION_INDEX
+        found = False
 
-        # Si tiene array de scores, usarlo
+        # Si tiene array de scores, usarlo (etiquetas fuera de ALL_EMOTIONS no suman)
         if 'scores' in result and isinstance(result['scores'], list):
             for item in result['scores']:
                 if isinstance(item, dict) and 'label' in item and 'score' in item:
-                    emotion = self._normalize_emotion(item['label'])
-                    scores_dict[emotion] = float(item['score'])
+                    found = True
+                    i = idx.get(_normalize_emotion(item['label']))
+                    if i is not None:
+                        vec[i] = float(item['score'])
 
         # Si no tiene distribución completa, crear una sintética
-        if not scores_dict and 'label' in result and 'score' in result:
-            emotion = self._normalize_emotion(result['label'])
+        if not found and 'label' in result and 'score' in result:
+            i = idx.get(_normalize_emotion(result['label']))
             score = float(result['score'])
-            # Crear distribución sintética: dar todo el peso a la emoción detectada
-            scores_dict[emotion] = score
-            # Distribuir el resto uniformemente (opcional)
+            # Distribuir el resto uniformemente entre las demás emociones
             remaining = 1.0 - score
-            other_emotions = [e for e in self.ALL_EMOTIONS if e != emotion]
-            if other_emotions and remaining > 0:
-                per_other = remaining / len(other_emotions)
-                for other in other_emotions:
-                    scores_dict[other] = per_other
+            if remaining > 0:
+                vec.fill(remaining / (len(vec) - 1 if i is not None else len(vec)))
+            # Dar todo el peso a la emoción detectada
+            if i is not None:
+                vec[i] = score
 
-        return scores_dict
+        return vec
 
     def _fallback_neutral(self, face_result: Dict, audio_result: Dict) -> Dict:
         """Ambas modalidades tienen confianza muy baja"""
-        return {
-            'emotion': 'neutral',
-            'confidence': 0.50,
-            'strategy': 'fallback_neutral',
-            'weights': {'face': 0.0, 'audio': 0.0},
-            'face': face_result,
-            'audio': audio_result,
-            'debug': {
+        return self._build_result(
+            'neutral', 0.50, 'fallback_neutral', 0.0, 0.0,
+            face_result, audio_result,
+            {
                 'reason': 'Both modalities below min_confidence',
                 'both_agree': False
             }
-        }
+        )
 
     def _audio_only(self, audio_result: Dict) -> Dict:
         """Solo audio tiene confianza suficiente"""
-        emotion = self._normalize_emotion(audio_result.get('label', 'neutral'))
+        emotion = _normalize_emotion(audio_result.get('label', 'neutral'))
         confidence = float(audio_result.get('score', 0.0))
 
-        return {
-            'emotion': emotion,
-            'confidence': round(confidence, 4),
-            'strategy': 'audio_only',
-            'weights': {'face': 0.0, 'audio': 1.0},
-            'face': None,
-            'audio': audio_result,
-            'debug': {
+        return self._build_result(
+            emotion, confidence, 'audio_only', 0.0, 1.0,
+            None, audio_result,
+            {
                 'reason': 'Face below min_confidence',
                 'both_agree': False
             }
-        }
+        )
 
     def _face_only(self, face_result: Dict) -> Dict:
         """Solo face tiene confianza suficiente"""
-        emotion = self._normalize_emotion(face_result.get('label', 'neutral'))
+        emotion = _normalize_emotion(face_result.get('label', 'neutral'))
         confidence = float(face_result.get('score', 0.0))
 
-        return {
-            'emotion': emotion,
-            'confidence': round(confidence, 4),
-            'strategy': 'face_only',
-            'weights': {'face': 1.0, 'audio': 0.0},
-            'face': face_result,
-            'audio': None,
-            'debug': {
+        return self._build_result(
+            emotion, confidence, 'face_only', 1.0, 0.0,
+            face_result, None,
+            {
                 'reason': 'Audio below min_confidence',
                 'both_agree': False
             }
-        }
+        )
 
-    def _smooth_with_history(self, current_result: Dict, room: str) -> Dict:
+    def _smooth_with_history(self, current_result: Dict, room: str, now: Optional[float] = None) -> Dict:
         """
         Aplica suavizado temporal AGRESIVO usando historial de fusiones
 
@@ -692,6 +1096,7 @@ class ConfidenceBasedVotingFusion:
         Args:
             current_result: Resultado de fusión actual
             room: ID de sala para tracking
+            now: Tick de time.monotonic() de la fusión (opcional)
 
         Returns:
             Resultado ajustado con información temporal (o emoción previa si rechazada)
@@ -715,24 +1120,26 @@ class ConfidenceBasedVotingFusion:
         if not self.temporal_config['enable_smoothing']:
             return current_result
 
-        # Inicializar historial de sala si no existe
-        if room not in self.fusion_history:
-            self.fusion_history[room] = []
+        # Inicializar historial de sala si no existe (ring buffer: pisa la más antigua en O(1))
+        history = self.fusion_history.get(room)
+        if history is None:
+            history = self.fusion_history[room] = _RoomHistory(self.max_history_size)
 
-        history = self.fusion_history[room]
         current_emotion = current_result['emotion']
         current_confidence = current_result['confidence']
-        current_time = time.time()
+        current_time = time.monotonic() if now is None else now
+
+        # Decisión numérica en _smooth_core (Numba si está disponible), directo sobre el ring buffer
+        code, factor = _smooth_core(
+            history.emo, history.ts, history.head, history.size, history.run,
+            history.code(current_emotion), float(current_confidence), current_time,
+            self._smooth_params()
+        )
 
         # Necesitamos al menos N fusiones previas para aplicar suavizado
-        min_history = self.temporal_config['min_history_for_smoothing']
-        if len(history) < min_history:
+        if code == _SMOOTH_INSUFFICIENT:
             # Guardar en historial y retornar sin ajustes
-            history.append({
-                'emotion': current_emotion,
-                'confidence': current_confidence,
-                'timestamp': current_time
-            })
+            history.append(current_emotion, current_confidence, current_time)
             current_result['temporal'] = {
                 'adjustment': 'none',
                 'reason': 'insufficient_history',
@@ -740,190 +1147,160 @@ class ConfidenceBasedVotingFusion:
             }
             return current_result
 
-        # Extraer últimas emociones del historial (ventana más grande)
-        last_emotions = [h['emotion'] for h in history[-6:]]  # Últimas 6 (aumentado)
-        last_2_emotions = last_emotions[-2:] if len(last_emotions) >= 2 else []
-        last_3_emotions = last_emotions[-3:] if len(last_emotions) >= 3 else []
-        last_4_emotions = last_emotions[-4:] if len(last_emotions) >= 4 else []
-
-        # Obtener última emoción y su timestamp
-        last_fusion = history[-1]
-        last_emotion = last_fusion['emotion']
-        last_timestamp = last_fusion.get('timestamp', current_time)
+        last_emotion = history.last_emotion()
+        time_since_last = current_time - history.last_timestamp()
+        # Con debug_mode apagado 'temporal' lleva solo adjustment/reason (dicts constantes)
+        debug = self._debug_mode
 
         # ===================================================================
         # FILTRO 1: MÍNIMO TIEMPO DE EMOCIÓN (evita "flasheo")
         # ===================================================================
-        # Si la emoción cambió, verificar si ha pasado suficiente tiempo
-        time_since_last = current_time - last_timestamp
-        is_emotion_change = current_emotion != last_emotion
-        min_duration = self.temporal_config['min_emotion_duration_sec']
-        allow_neutral = self.temporal_config['allow_change_to_neutral']
-
-        if is_emotion_change and time_since_last < min_duration:
-            # Excepción: permitir cambio rápido a neutral
-            if not (allow_neutral and current_emotion == 'neutral'):
-                # RECHAZAR: mantener emoción previa
-                if self.config['debug_mode']:
-                    print(
-                        "[FUSION-TEMPORAL] 🚫 REJECTED: Change too fast " +
-                        f"({last_emotion} → {current_emotion}) after {time_since_last:.1f}s " +
-                        f"(min: {min_duration}s)"
-                    )
-
-                # Retornar emoción previa sin guardar en historial
-                return {
-                    **current_result,
-                    'emotion': last_emotion,
-                    'confidence': last_fusion['confidence'],
-                    'temporal': {
-                        'adjustment': 'rejected',
-                        'reason': 'change_too_fast',
-                        'time_since_last_sec': round(time_since_last, 2),
-                        'min_duration_sec': min_duration,
-                        'attempted_emotion': current_emotion,
-                        'maintained_emotion': last_emotion
-                    }
-                }
+        if code == _SMOOTH_REJECT_FAST:
+            min_duration = self.temporal_config['min_emotion_duration_sec']
+            # RECHAZAR: mantener emoción previa
+            if _DEBUG and debug:
+                logger.debug("[FUSION-TEMPORAL] 🚫 REJECTED: Change too fast (%s → %s) after %.1fs (min: %ss)",
+                             last_emotion, current_emotion, time_since_last, min_duration)
+
+            # Retornar emoción previa sin guardar en historial
+            current_result['emotion'] = last_emotion
+            current_result['confidence'] = history.last_confidence()
+            current_result['temporal'] = {
+                'adjustment': 'rejected',
+                'reason': 'change_too_fast',
+                'time_since_last_sec': round(time_since_last, 2),
+                'min_duration_sec': min_duration,
+                'attempted_emotion': current_emotion,
+                'maintained_emotion': last_emotion
+            } if debug else _TEMPORAL_REJECT_FAST
+            return current_result
 
         # ===================================================================
         # FILTRO 2: CONFIANZA MÍNIMA PARA CAMBIOS
         # ===================================================================
-        # Si la emoción cambió, requiere confianza mínima
-        if is_emotion_change:
+        if code == _SMOOTH_REJECT_LOW_CONF:
             min_conf_change = self.temporal_config['min_confidence_for_change']
-            if current_confidence < min_conf_change:
-                if self.config['debug_mode']:
-                    print(
-                        "[FUSION-TEMPORAL] 🚫 REJECTED: Low confidence for change " +
-                        f"({current_emotion} {current_confidence:.2f} < {min_conf_change:.2f})"
-                    )
+            if _DEBUG and debug:
+                logger.debug("[FUSION-TEMPORAL] 🚫 REJECTED: Low confidence for change (%s %.2f < %.2f)",
+                             current_emotion, current_confidence, min_conf_change)
 
-                # Mantener emoción previa
-                return {
-                    **current_result,
-                    'emotion': last_emotion,
-                    'confidence': last_fusion['confidence'],
-                    'temporal': {
-                        'adjustment': 'rejected',
-                        'reason': 'low_confidence_for_change',
-                        'current_confidence': current_confidence,
-                        'min_required': min_conf_change,
-                        'attempted_emotion': current_emotion,
-                        'maintained_emotion': last_emotion
-                    }
-                }
+            # Mantener emoción previa
+            current_result['emotion'] = last_emotion
+            current_result['confidence'] = history.last_confidence()
+            current_result['temporal'] = {
+                'adjustment': 'rejected',
+                'reason': 'low_confidence_for_change',
+                'current_confidence': current_confidence,
+                'min_required': min_conf_change,
+                'attempted_emotion': current_emotion,
+                'maintained_emotion': last_emotion
+            } if debug else _TEMPORAL_REJECT_LOW_CONF
+            return current_result
+
+        # Últimas emociones del historial (ventana de 6), solo para el detalle en 'temporal'
+        last_emotions = history.recent_emotions(6) if debug else None
 
         # ===================================================================
         # CASO 1: EMOCIÓN MUY CONSISTENTE (aparece en últimas 4+)
         # ===================================================================
         # Ejemplo: [happy, happy, happy, happy] → happy (boost fuerte)
-        if len(last_4_emotions) >= 4 and all(e == current_emotion for e in last_4_emotions):
-            adjustment = self.temporal_config['strong_consistency_boost']
-            current_result['confidence'] = min(current_confidence * adjustment, 1.0)
+        if code == _SMOOTH_STRONG:
+            current_result['confidence'] = min(current_confidence * factor, 1.0)
             current_result['temporal'] = {
                 'adjustment': 'strong_consistency_boost',
-                'reason': f'emotion_very_consistent_last_{len(last_4_emotions)}',
-                'boost_factor': adjustment,
+                'reason': 'emotion_very_consistent_last_4',
+                'boost_factor': factor,
                 'original_confidence': current_confidence,
                 'adjusted_confidence': current_result['confidence'],
                 'history': last_emotions
-            }
+            } if debug else _TEMPORAL_STRONG
 
-            if self.config['debug_mode']:
-                print(f"[FUSION-TEMPORAL] ✨ STRONG consistency: {current_emotion} in last {len(last_4_emotions)} fusions (+{int((adjustment-1)*100)}%)")
+            if _DEBUG and debug:
+                logger.debug("[FUSION-TEMPORAL] ✨ STRONG consistency: %s in last 4 fusions (+%d%%)",
+                             current_emotion, int((factor - 1) * 100))
 
         # ===================================================================
         # CASO 2: EMOCIÓN CONSISTENTE (aparece en últimas 2-3)
         # ===================================================================
         # Ejemplo: [happy, happy] → happy (boost moderado)
-        elif len(last_2_emotions) >= 2 and all(e == current_emotion for e in last_2_emotions):
-            adjustment = self.temporal_config['consistency_boost']
-            current_result['confidence'] = min(current_confidence * adjustment, 1.0)
+        elif code == _SMOOTH_CONSISTENT:
+            current_result['confidence'] = min(current_confidence * factor, 1.0)
             current_result['temporal'] = {
                 'adjustment': 'consistency_boost',
-                'reason': f'emotion_consistent_with_last_{len(last_2_emotions)}',
-                'boost_factor': adjustment,
+                'reason': 'emotion_consistent_with_last_2',
+                'boost_factor': factor,
                 'original_confidence': current_confidence,
                 'adjusted_confidence': current_result['confidence'],
                 'history': last_emotions
-            }
+            } if debug else _TEMPORAL_CONSISTENT
 
-            if self.config['debug_mode']:
-                print(f"[FUSION-TEMPORAL] ✅ Consistency: {current_emotion} in last {len(last_2_emotions)} fusions (+{int((adjustment-1)*100)}%)")
+            if _DEBUG and debug:
+                logger.debug("[FUSION-TEMPORAL] ✅ Consistency: %s in last 2 fusions (+%d%%)",
+                             current_emotion, int((factor - 1) * 100))
 
         # ===================================================================
         # CASO 3: OUTLIER FUERTE (diferente a las últimas 3+)
         # ===================================================================
         # Ejemplo: [happy, happy, happy] → sad (outlier)
-        elif len(last_3_emotions) >= 3 and all(e != current_emotion for e in last_3_emotions):
-            adjustment = self.temporal_config['outlier_penalty']
-            adjusted_confidence = current_confidence * adjustment
+        elif code == _SMOOTH_OUTLIER or code == _SMOOTH_REJECT_OUTLIER:
+            last_3_emotions = last_emotions[-3:] if debug else None
+            adjusted_confidence = current_confidence * factor
             current_result['confidence'] = adjusted_confidence
 
             # Si es outlier débil, RECHAZAR completamente
-            if self.temporal_config['weak_outlier_reject'] and adjusted_confidence < 0.50:
-                if self.config['debug_mode']:
-                    print(
-                        "[FUSION-TEMPORAL] 🚫 REJECTED: Weak outlier " +
-                        f"({current_emotion} {adjusted_confidence:.2f} < 0.50) vs {last_3_emotions}"
-                    )
+            if code == _SMOOTH_REJECT_OUTLIER:
+                if _DEBUG and debug:
+                    logger.debug("[FUSION-TEMPORAL] 🚫 REJECTED: Weak outlier (%s %.2f < 0.50) vs %s",
+                                 current_emotion, adjusted_confidence, last_3_emotions)
 
                 # Mantener emoción previa
-                return {
-                    **current_result,
-                    'emotion': last_emotion,
-                    'confidence': last_fusion['confidence'],
-                    'temporal': {
-                        'adjustment': 'rejected',
-                        'reason': 'weak_outlier',
-                        'attempted_emotion': current_emotion,
-                        'attempted_confidence': adjusted_confidence,
-                        'maintained_emotion': last_emotion,
-                        'history': last_3_emotions
-                    }
-                }
+                current_result['emotion'] = last_emotion
+                current_result['confidence'] = history.last_confidence()
+                current_result['temporal'] = {
+                    'adjustment': 'rejected',
+                    'reason': 'weak_outlier',
+                    'attempted_emotion': current_emotion,
+                    'attempted_confidence': adjusted_confidence,
+                    'maintained_emotion': last_emotion,
+                    'history': last_3_emotions
+                } if debug else _TEMPORAL_REJECT_OUTLIER
+                return current_result
 
             # Outlier aceptado pero con penalización
             current_result['temporal'] = {
                 'adjustment': 'outlier_penalty',
-                'reason': f'emotion_differs_from_last_{len(last_3_emotions)}',
-                'penalty_factor': adjustment,
+                'reason': 'emotion_differs_from_last_3',
+                'penalty_factor': factor,
                 'original_confidence': current_confidence,
                 'adjusted_confidence': adjusted_confidence,
                 'history': last_emotions,
                 'current_emotion': current_emotion,
                 'historical_emotions': last_3_emotions
-            }
+            } if debug else _TEMPORAL_OUTLIER
 
-            if self.config['debug_mode']:
-                print(
-                    f"[FUSION-TEMPORAL] ⚠️ OUTLIER: {current_emotion} vs {last_3_emotions} " +
-                    f"(-{int((1-adjustment)*100)}% → {adjusted_confidence:.2f})"
-                )
+            if _DEBUG and debug:
+                logger.debug("[FUSION-TEMPORAL] ⚠️ OUTLIER: %s vs %s (-%d%% → %.2f)",
+                             current_emotion, last_3_emotions, int((1 - factor) * 100), adjusted_confidence)
 
         # ===================================================================
         # CASO 4: CAMBIO BRUSCO (diferente solo a la última)
         # ===================================================================
         # Ejemplo: [neutral, happy] → sad (cambio brusco)
-        elif is_emotion_change:
-            adjustment = self.temporal_config['sudden_change_penalty']
-            current_result['confidence'] = current_confidence * adjustment
+        elif code == _SMOOTH_SUDDEN:
+            current_result['confidence'] = current_confidence * factor
             current_result['temporal'] = {
                 'adjustment': 'sudden_change',
                 'reason': 'emotion_changed_from_previous',
-                'penalty_factor': adjustment,
+                'penalty_factor': factor,
                 'original_confidence': current_confidence,
                 'adjusted_confidence': current_result['confidence'],
                 'previous_emotion': last_emotion,
                 'current_emotion': current_emotion
-            }
+            } if debug else _TEMPORAL_SUDDEN
 
-            if self.config['debug_mode']:
-                print(
-                    f"[FUSION-TEMPORAL] 🔄 CHANGE: {last_emotion} → {current_emotion} " +
-                    f"(-{int((1-adjustment)*100)}% → {current_result['confidence']:.2f})"
-                )
+            if _DEBUG and debug:
+                logger.debug("[FUSION-TEMPORAL] 🔄 CHANGE: %s → %s (-%d%% → %.2f)",
+                             last_emotion, current_emotion, int((1 - factor) * 100), current_result['confidence'])
 
         # ===================================================================
         # CASO 5: SIN AJUSTE (misma emoción, sin patrón especial)
@@ -933,27 +1310,39 @@ class ConfidenceBasedVotingFusion:
                 'adjustment': 'none',
                 'reason': 'normal_progression',
                 'history': last_emotions
-            }
+            } if debug else _TEMPORAL_NORMAL
 
         # Guardar fusión actual en historial
         # IMPORTANTE: guardar la emoción FINAL (puede haber sido ajustada)
-        history.append({
-            'emotion': current_result['emotion'],  # Emoción final (puede ser diferente si hubo rechazo)
-            'confidence': current_result['confidence'],
-            'timestamp': current_time,
-            'adjustment': current_result['temporal']['adjustment']
-        })
-
-        # Limitar tamaño del historial
-        if len(history) > self.max_history_size:
-            history.pop(0)  # Remover más antigua
-
-        # Actualizar historial
-        self.fusion_history[room] = history
+        history.append(
+            current_result['emotion'],  # Emoción final (puede ser diferente si hubo rechazo)
+            current_result['confidence'],
+            current_time,
+            current_result['temporal']['adjustment']
+        )
 
         return current_result
 
-    def _apply_persistence(self, result: Dict, room: str) -> Dict:
+    def _smooth_params(self) -> np.ndarray:
+        """Parámetros de _smooth_core como vector; se rearma solo si cambió la config"""
+        if self._smooth_params_version != self._config_version:
+            tc = self.temporal_config
+            self._smooth_params_arr = np.array([
+                tc['min_history_for_smoothing'],
+                tc['min_emotion_duration_sec'],
+                1.0 if tc['allow_change_to_neutral'] else 0.0,
+                _EMOTION_INDEX['neutral'],
+                tc['min_confidence_for_change'],
+                1.0 if tc['weak_outlier_reject'] else 0.0,
+                tc['strong_consistency_boost'],
+                tc['consistency_boost'],
+                tc['outlier_penalty'],
+                tc['sudden_change_penalty'],
+            ], dtype=np.float64)
+            self._smooth_params_version = self._config_version
+        return self._smooth_params_arr
+
+    def _apply_persistence(self, result: Dict, room: str, now: Optional[float] = None) -> Dict:
         """
         Aplica persistencia emocional para evitar neutral bias
 
@@ -964,6 +1353,7 @@ class ConfidenceBasedVotingFusion:
         Args:
             result: Resultado de fusión actual (después de suavizado temporal)
             room: ID de sala
+            now: Tick de time.monotonic() de la fusión (opcional)
 
         Returns:
             Resultado con persistencia aplicada
@@ -983,7 +1373,7 @@ class ConfidenceBasedVotingFusion:
 
         # Aplicar persistencia
         final_emotion, final_confidence, used_persistence = persistence.update(
-            current_emotion, current_confidence
+            current_emotion, current_confidence, now
         )
 
         # Si se usó persistencia, actualizar resultado
@@ -1003,11 +1393,9 @@ class ConfidenceBasedVotingFusion:
                 'decay_rate': persistence.decay_rate
             }
 
-            if self.config['debug_mode']:
-                print(
-                    f"[FUSION-PERSIST] 💾 Using persistence: {original_emotion} ({original_confidence:.2f}) " +
-                    f"→ {final_emotion} ({final_confidence:.2f})"
-                )
+            if _DEBUG and self._debug_mode:
+                logger.debug("[FUSION-PERSIST] 💾 Using persistence: %s (%.2f) → %s (%.2f)",
+                             original_emotion, original_confidence, final_emotion, final_confidence)
         else:
             result['persistence'] = {
                 'used': False,
@@ -1037,6 +1425,7 @@ class ConfidenceBasedVotingFusion:
         """
         if room in self.fusion_history:
             del self.fusion_history[room]
+        self._history_version += 1
 
         if room in self.ema_systems:
             self.ema_systems[room].reset()
@@ -1049,14 +1438,21 @@ class ConfidenceBasedVotingFusion:
                 min_persistence=0.35
             )
 
-        if self.config['debug_mode']:
-            print(f"[FUSION] 🧹 Cleared history for room: {room}")
+        if self._debug_mode:
+            logger.debug("[FUSION] 🧹 Cleared history for room: %s", room)
 
     def update_config(self, new_config: Dict) -> None:
         """Actualiza configuración en caliente"""
         self.config.update(new_config)
-        if self.config['debug_mode']:
-            print(f"[FUSION] Config updated: {new_config}")
+        self._sync_config()
+        self._config_version += 1
+        if self._debug_mode:
+            logger.debug("[FUSION] Config updated: %s", new_config)
+
+    def update_temporal_config(self, new_config: Dict) -> None:
+        """Actualiza configuración de suavizado temporal en caliente"""
+        self.temporal_config.update(new_config)
+        self._config_version += 1
 
 
 # Instancia global (singleton)
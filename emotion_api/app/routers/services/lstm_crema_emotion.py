@@ -9,14 +9,19 @@ import librosa
 import numpy as np
 import pickle
 import os
-from typing import Dict, List, Any
+from functools import lru_cache
+from typing import Dict, Any
 from tensorflow import keras
 
+from ._lstm_runtime import build_predict_fn, load_onnx_session, predict
+
 logger = logging.getLogger(__name__)
 
 # Model configuration
 MODEL_DIR = "models/lstm_crema_v3"  # Path relative to emotion_api root
 MODEL_PATH = os.path.join(MODEL_DIR, "best_model.keras")
+ONNX_PATH = os.path.join(MODEL_DIR, "best_model.onnx")
+ONNX_INT8_PATH = os.path.join(MODEL_DIR, "best_model.int8.onnx")
 LABEL_ENCODER_PATH = os.path.join(MODEL_DIR, "label_encoder.pkl")
 METADATA_PATH = os.path.join(MODEL_DIR, "model_metadata.json")
 
@@ -26,6 +31,55 @@ MAX_PAD_LEN = 130
 DURATION = 3.0
 
 
+@lru_cache(maxsize=128)
+def _features_for_path(audio_path: str, mtime_ns: int, size: int) -> np.ndarray:
+    """
+    Load audio and compute the (1, MAX_PAD_LEN, F) V3 feature matrix.
+
+    Cached per (path, mtime_ns, size): the same uploaded file classified again
+    skips librosa.load and the four feature extractors.
+    """
+    y, sr = librosa.load(audio_path, duration=DURATION, sr=SAMPLE_RATE)
+
+    # One STFT for all four features (librosa defaults: n_fft=2048, hop=512);
+    # passing S= gives the same values as letting each feature run its own STFT
+    S_mag = np.abs(librosa.stft(y))
+    S_power = S_mag ** 2
+    mel_power = librosa.feature.melspectrogram(S=S_power, sr=sr)
+
+    # 1. MFCC (log-mel of the same mel spectrogram, as mfcc(y=...) does internally)
+    mfcc = librosa.feature.mfcc(S=librosa.power_to_db(mel_power), sr=sr, n_mfcc=40)
+    mfcc = np.pad(mfcc, ((0, 0), (0, max(0, MAX_PAD_LEN - mfcc.shape[1]))), mode='constant')
+    mfcc = mfcc[:, :MAX_PAD_LEN]
+
+    # 2. Chroma
+    chroma = librosa.feature.chroma_stft(S=S_power, sr=sr)
+    chroma = np.pad(chroma, ((0, 0), (0, max(0, MAX_PAD_LEN - chroma.shape[1]))), mode='constant')
+    chroma = chroma[:, :MAX_PAD_LEN]
+
+    # 3. Mel Spectrogram
+    mel = np.pad(mel_power, ((0, 0), (0, max(0, MAX_PAD_LEN - mel_power.shape[1]))), mode='constant')
+    mel = mel[:, :MAX_PAD_LEN]
+
+    # 4. Spectral Contrast
+    contrast = librosa.feature.spectral_contrast(S=S_mag, sr=sr)
+    contrast = np.pad(contrast, ((0, 0), (0, max(0, MAX_PAD_LEN - contrast.shape[1]))), mode='constant')
+    contrast = contrast[:, :MAX_PAD_LEN]
+
+    # Combine all features
+    features = np.vstack([mfcc, chroma, mel, contrast])
+
+    # Transpose for LSTM: (timesteps, features)
+    features = features.T
+
+    # Add batch dimension: (1, timesteps, features)
+    features = np.expand_dims(features, axis=0)
+
+    # Shared between callers through the cache: never modified in place
+    features.setflags(write=False)
+    return features
+
+
 class LSTMCremaEmotionModel:
     """LSTM model trained on CREMA-D dataset for emotion recognition"""
 
@@ -33,6 +87,9 @@ class LSTMCremaEmotionModel:
         self.model = None
         self.label_encoder = None
         self.metadata = None
+        self._predict_fn = None
+        self.session = None
+        self.input_name = None
         self._load_model()
 
     def _load_model(self):
@@ -51,6 +108,14 @@ class LSTMCremaEmotionModel:
             # Load model
             self.model = keras.models.load_model(model_path)
             logger.info("Model loaded successfully")
+            self.session, self.input_name = load_onnx_session(
+                self.model,
+                model_path,
+                os.path.join(api_root, ONNX_PATH),
+                os.path.join(api_root, ONNX_INT8_PATH)
+            )
+            if self.session is None:
+                self._predict_fn = build_predict_fn(self.model)
 
             # Load label encoder
             with open(encoder_path, 'rb') as f:
@@ -80,37 +145,8 @@ class LSTMCremaEmotionModel:
         - Spectral Contrast
         """
         try:
-            # Load audio
-            y, sr = librosa.load(audio_path, duration=DURATION, sr=SAMPLE_RATE)
-
-            # 1. MFCC
-            mfcc = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=40)
-            mfcc = np.pad(mfcc, ((0, 0), (0, max(0, MAX_PAD_LEN - mfcc.shape[1]))), mode='constant')
-            mfcc = mfcc[:, :MAX_PAD_LEN]
-
-            # 2. Chroma
-            chroma = librosa.feature.chroma_stft(y=y, sr=sr)
-            chroma = np.pad(chroma, ((0, 0), (0, max(0, MAX_PAD_LEN - chroma.shape[1]))), mode='constant')
-            chroma = chroma[:, :MAX_PAD_LEN]
-
-            # 3. Mel Spectrogram
-            mel = librosa.feature.melspectrogram(y=y, sr=sr)
-            mel = np.pad(mel, ((0, 0), (0, max(0, MAX_PAD_LEN - mel.shape[1]))), mode='constant')
-            mel = mel[:, :MAX_PAD_LEN]
-
-            # 4. Spectral Contrast
-            contrast = librosa.feature.spectral_contrast(y=y, sr=sr)
-            contrast = np.pad(contrast, ((0, 0), (0, max(0, MAX_PAD_LEN - contrast.shape[1]))), mode='constant')
-            contrast = contrast[:, :MAX_PAD_LEN]
-
-            # Combine all features
-            features = np.vstack([mfcc, chroma, mel, contrast])
-
-            # Transpose for LSTM: (timesteps, features)
-            features = features.T
-
-            # Add batch dimension: (1, timesteps, features)
-            features = np.expand_dims(features, axis=0)
+            st = os.stat(audio_path)
+            features = _features_for_path(audio_path, st.st_mtime_ns, st.st_size)
 
             logger.debug(f"Advanced features extracted: shape={features.shape}")
             return features
@@ -134,7 +170,7 @@ class LSTMCremaEmotionModel:
             features = self._extract_features_advanced(audio_path)
 
             # Make prediction
-            predictions = self.model.predict(features, verbose=0)
+            predictions = predict(self.session, self.input_name, self._predict_fn, features)
 
             # Get predicted class
             predicted_class_idx = np.argmax(predictions[0])
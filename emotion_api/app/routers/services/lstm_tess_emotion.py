@@ -8,14 +8,19 @@ import librosa
 import numpy as np
 import pickle
 import os
-from typing import Dict, List, Any
+from functools import lru_cache
+from typing import Dict, Any
 from tensorflow import keras
 
+from ._lstm_runtime import build_predict_fn, load_onnx_session, predict
+
 logger = logging.getLogger(__name__)
 
 # Model configuration
 MODEL_DIR = "models/lstm_tess"  # Path relative to emotion_api root
 MODEL_PATH = os.path.join(MODEL_DIR, "best_model.keras")
+ONNX_PATH = os.path.join(MODEL_DIR, "best_model.onnx")
+ONNX_INT8_PATH = os.path.join(MODEL_DIR, "best_model.int8.onnx")
 LABEL_ENCODER_PATH = os.path.join(MODEL_DIR, "label_encoder.pkl")
 METADATA_PATH = os.path.join(MODEL_DIR, "model_metadata.json")
 
@@ -26,6 +31,37 @@ DURATION = 3
 OFFSET = 0.5
 
 
+@lru_cache(maxsize=128)
+def _mfcc_for_path(audio_path: str, mtime_ns: int, size: int) -> np.ndarray:
+    """
+    Load audio and compute the (1, N_MFCC, 1) MFCC input for the LSTM.
+
+    Cached per (path, mtime_ns, size): the same uploaded file classified again
+    skips librosa.load + MFCC; a rewritten file gets a new key.
+    """
+    y, sr = librosa.load(
+        audio_path,
+        duration=DURATION,
+        offset=OFFSET,
+        sr=SAMPLE_RATE
+    )
+
+    # Extract MFCC features
+    mfcc = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=N_MFCC)
+
+    # Average across time (same as training)
+    mfcc_mean = np.mean(mfcc.T, axis=0)
+
+    # Reshape for LSTM input: (batch_size, timesteps, features)
+    mfcc_input = np.expand_dims(mfcc_mean, axis=-1)  # Add channel dim
+    mfcc_input = np.expand_dims(mfcc_input, axis=0)   # Add batch dim
+    mfcc_input = mfcc_input.astype(np.float32)
+
+    # Shared between callers through the cache: never modified in place
+    mfcc_input.setflags(write=False)
+    return mfcc_input
+
+
 class LSTMTESSEmotionModel:
     """Custom LSTM model trained on TESS dataset for emotion recognition"""
 
@@ -33,6 +69,9 @@ class LSTMTESSEmotionModel:
         self.model = None
         self.label_encoder = None
         self.metadata = None
+        self._predict_fn = None
+        self.session = None
+        self.input_name = None
         self._load_model()
 
     def _load_model(self):
@@ -51,6 +90,14 @@ class LSTMTESSEmotionModel:
             # Load model
             self.model = keras.models.load_model(model_path)
             logger.info("Model loaded successfully")
+            self.session, self.input_name = load_onnx_session(
+                self.model,
+                model_path,
+                os.path.join(api_root, ONNX_PATH),
+                os.path.join(api_root, ONNX_INT8_PATH)
+            )
+            if self.session is None:
+                self._predict_fn = build_predict_fn(self.model)
 
             # Load label encoder
             with open(encoder_path, 'rb') as f:
@@ -82,23 +129,8 @@ class LSTMTESSEmotionModel:
             MFCC feature vector
         """
         try:
-            # Load audio
-            y, sr = librosa.load(
-                audio_path,
-                duration=DURATION,
-                offset=OFFSET,
-                sr=SAMPLE_RATE
-            )
-
-            # Extract MFCC features
-            mfcc = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=N_MFCC)
-
-            # Average across time (same as training)
-            mfcc_mean = np.mean(mfcc.T, axis=0)
-
-            # Reshape for LSTM input: (batch_size, timesteps, features)
-            mfcc_input = np.expand_dims(mfcc_mean, axis=-1)  # Add channel dim
-            mfcc_input = np.expand_dims(mfcc_input, axis=0)   # Add batch dim
+            st = os.stat(audio_path)
+            mfcc_input = _mfcc_for_path(audio_path, st.st_mtime_ns, st.st_size)
 
             logger.debug(f"MFCC features extracted: shape={mfcc_input.shape}")
             return mfcc_input
@@ -122,7 +154,7 @@ class LSTMTESSEmotionModel:
             features = self._preprocess_audio(audio_path)
 
             # Make prediction
-            predictions = self.model.predict(features, verbose=0)
+            predictions = predict(self.session, self.input_name, self._predict_fn, features)
 
             # Get predicted class
             predicted_class_idx = np.argmax(predictions[0])
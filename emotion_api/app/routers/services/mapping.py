@@ -1,4 +1,5 @@
 # app/services/mapping.py
+from functools import lru_cache
 
 # ========= FACE7: mapeo para fusión/Pepper =========
 # Añadimos las identidades (passthrough) de las 7 canónicas.
@@ -35,7 +36,9 @@ SHORT_TO_FACE7 = {
 
 FACE7 = {"happy", "sad", "angry", "surprised", "fearful", "disgusted", "neutral"}
 
+@lru_cache(maxsize=256)
 def map_to_face7(label: str) -> str:
+    # El universo de etiquetas es chico y fijo: se normaliza una vez por etiqueta
     if not label:
         return "neutral"
     lab = label.lower().strip()
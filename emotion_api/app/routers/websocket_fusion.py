@@ -128,13 +128,13 @@ class ConnectionManager:
                         "timestamp": asyncio.get_event_loop().time(),
                         "room": room
                     })
-                    logger.debug(f"[WS] Heartbeat sent to room {room}")
+                    logger.debug("[WS] Heartbeat sent to room %s", room)
                 except Exception as e:
                     logger.warning(f"[WS] Heartbeat failed for room {room}: {e}")
                     break  # Conexión muerta
 
         except asyncio.CancelledError:
-            logger.debug(f"[WS] Heartbeat task cancelled for room {room}")
+            logger.debug("[WS] Heartbeat task cancelled for room %s", room)
 
     def get_room_count(self, room: str) -> int:
         """Retorna número de conexiones en una room"""
@@ -1,17 +1,16 @@
 # app/services/asr_whisper.py
-import whisper
+from faster_whisper import WhisperModel
 from ..config import settings
 
-def transcribe_audio_file(asr_model: whisper.Whisper, file_path: str) -> str:
+def transcribe_audio_file(asr_model: WhisperModel, file_path: str) -> str:
     opts = {
     "language": None if settings.asr_language == "auto" else settings.asr_language,
     "temperature": 0.0,
     "best_of": 5,
     "beam_size": 5,
     "condition_on_previous_text": False,
-    "fp16": False
     }
 
-    result = asr_model.transcribe(file_path, **opts)
-    return (result.get("text") or "").strip()
-
+    # segments es un generador: la decodificación ocurre al recorrerlo
+    segments, _info = asr_model.transcribe(file_path, **opts)
+    return "".join(seg.text for seg in segments).strip()
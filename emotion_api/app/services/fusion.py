@@ -1,5 +1,5 @@
 # app/services/fusion.py
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 from ..config import settings
 from .mapping import map_to_face7, FACE7
 
@@ -8,8 +8,9 @@ NON_NEUTRALS = [e for e in FACE7 if e != "neutral"]
 
 def _to_face7(scores: List[Dict]) -> Dict[str, float]:
     d: Dict[str, float] = {}
+    m = map_to_face7  # lookup del global una sola vez fuera del loop
     for r in scores:
-        lab = map_to_face7(r["label"])
+        lab = m(r["label"])
         d[lab] = d.get(lab, 0.0) + float(r["score"])
     for k in FACE7:
         d.setdefault(k, 0.0)
@@ -34,7 +35,11 @@ def _redistribute_neutral(f: Dict[str, float]) -> Dict[str, float]:
     f["neutral"] = 0.0
     return f
 
-def fuse(text_scores: List[Dict], audio_scores: List[Dict]) -> Dict[str, float]:
+def _strategy() -> str:
+    return (settings.neutral_strategy or "penalize").lower()
+
+def fuse_with_strategy(text_scores: List[Dict], audio_scores: List[Dict]) -> Tuple[Dict[str, float], str]:
+    """Como fuse(), pero devuelve también la estrategia de neutral ya resuelta para pick_label()."""
     t = _to_face7(text_scores)
     a = _to_face7(audio_scores)
 
@@ -52,7 +57,7 @@ def fuse(text_scores: List[Dict], audio_scores: List[Dict]) -> Dict[str, float]:
     fused = {k: wt * t[k] + wa * a[k] for k in FACE7}
 
     # === estrategia de neutral ===
-    strat = (settings.neutral_strategy or "penalize").lower()
+    strat = _strategy()
     if strat == "penalize":
         fused["neutral"] *= settings.neutral_penalty
     elif strat == "ban_redistribute":
@@ -64,10 +69,15 @@ def fuse(text_scores: List[Dict], audio_scores: List[Dict]) -> Dict[str, float]:
         # fallback seguro: penalize
         fused["neutral"] *= settings.neutral_penalty
 
-    return fused
+    return fused, strat
+
+def fuse(text_scores: List[Dict], audio_scores: List[Dict]) -> Dict[str, float]:
+    return fuse_with_strategy(text_scores, audio_scores)[0]
 
-def pick_label(fused: Dict[str, float]) -> str:
-    strat = (settings.neutral_strategy or "penalize").lower()
+def pick_label(fused: Dict[str, float], strat: Optional[str] = None) -> str:
+    # strat: la que devolvió fuse_with_strategy(); si no viene se resuelve aquí
+    if strat is None:
+        strat = _strategy()
 
     # Si se decide “ban_pick”, ignoramos neutral al elegir
     if strat == "ban_pick":
@@ -4,6 +4,7 @@ Global state management for Pepper process status
 """
 from __future__ import annotations
 import threading
+from collections import deque
 from typing import Dict, Any
 import logging
 
@@ -119,12 +120,15 @@ class EmotionBuffer:
         self.timeout = timeout
         self.max_age = max_age
         self.fusion_timeout = fusion_timeout
-        # Estructura: {room: {"face": [...], "audio": [...]}}
-        self._buffer: Dict[str, Dict[str, list]] = {}
+        # Estructura: {room: {"face": deque, "audio": deque}}; maxlen=max_size descarta
+        # la detección más vieja al agregar, en O(1)
+        self._buffer: Dict[str, Dict[str, deque]] = {}
         # WebSocket event callbacks
         self._event_callbacks = []
         # Estadísticas de timeouts
         self._timeout_stats: Dict[str, Dict[str, int]] = {}  # {room: {face_timeouts, audio_timeouts, partial_fusions}}
+        # Se incrementa en cada escritura (ETag / caché de /fusion/buffer-stats)
+        self.version = 0
 
     def add_face(self, room: str, result: Dict[str, Any]) -> None:
         """
@@ -137,32 +141,28 @@ class EmotionBuffer:
         """
         with self._lock:
             if room not in self._buffer:
-                self._buffer[room] = {"face": [], "audio": []}
+                self._buffer[room] = self._new_room()
 
             # Agregar timestamp
             result["timestamp"] = self._get_timestamp()
 
+            # Se mantienen solo las últimas N detecciones (deque con maxlen)
             self._buffer[room]["face"].append(result)
-
-            # Mantener solo las últimas N detecciones
-            if len(self._buffer[room]["face"]) > self.max_size:
-                self._buffer[room]["face"].pop(0)
-
-            # Log con información de agregación si está disponible
-            frame_count = result.get('frameCount', 0)
-            consensus = result.get('consensusRatio', 0)
-
-            if frame_count > 0:
-                logger.debug(
-                    f"[BUFFER] 👤 Face window buffered: {result.get('label')} "
-                    f"({result.get('score', 0):.2f}) | "
-                    f"{frame_count} frames | consensus: {consensus:.1%}"
-                )
-            else:
-                logger.debug(
-                    f"[BUFFER] 👤 Face buffered: {result.get('label')} "
-                    f"({result.get('score', 0):.2f})"
-                )
+            self.version += 1
+
+            # Log con información de agregación si está disponible (formato %: el
+            # mensaje solo se arma si DEBUG está activo; esto corre por cada frame)
+            if logger.isEnabledFor(logging.DEBUG):
+                frame_count = result.get('frameCount', 0)
+                if frame_count > 0:
+                    logger.debug(
+                        "[BUFFER] 👤 Face window buffered: %s (%.2f) | %s frames | consensus: %.1f%%",
+                        result.get('label'), result.get('score', 0),
+                        frame_count, result.get('consensusRatio', 0) * 100
+                    )
+                else:
+                    logger.debug("[BUFFER] 👤 Face buffered: %s (%.2f)",
+                                 result.get('label'), result.get('score', 0))
 
     def add_audio(self, room: str, result: Dict[str, Any]) -> None:
         """
@@ -178,16 +178,14 @@ class EmotionBuffer:
         """
         with self._lock:
             if room not in self._buffer:
-                self._buffer[room] = {"face": [], "audio": []}
+                self._buffer[room] = self._new_room()
 
             # Agregar timestamp
             result["timestamp"] = self._get_timestamp()
 
+            # Se mantienen solo las últimas N detecciones (deque con maxlen)
             self._buffer[room]["audio"].append(result)
-
-            # Mantener solo las últimas N detecciones
-            if len(self._buffer[room]["audio"]) > self.max_size:
-                self._buffer[room]["audio"].pop(0)
+            self.version += 1
 
             logger.info(
                 f"[BUFFER] 🎤 Audio arrived: {result.get('label')} ({result.get('score', 0):.2f}) "
@@ -247,12 +245,14 @@ class EmotionBuffer:
         with self._lock:
             if room in self._buffer:
                 del self._buffer[room]
-                logger.debug(f"[BUFFER] Cleared buffer for room {room}")
+                self.version += 1
+                logger.debug("[BUFFER] Cleared buffer for room %s", room)
 
     def clear_all(self) -> None:
         """Limpia todo el buffer"""
         with self._lock:
             self._buffer.clear()
+            self.version += 1
             logger.debug("[BUFFER] Cleared all buffers")
 
     def _clean_expired(self, room: str, modality: str) -> int:
@@ -265,18 +265,11 @@ class EmotionBuffer:
         if room not in self._buffer:
             return 0
 
-        now = self._get_timestamp()
-        initial_count = len(self._buffer[room][modality])
-
-        self._buffer[room][modality] = [
-            det for det in self._buffer[room][modality]
-            if (now - det.get("timestamp", 0)) <= self.timeout
-        ]
-
-        removed = initial_count - len(self._buffer[room][modality])
+        removed = self._drop_older_than(self._buffer[room][modality], self.timeout)
 
         if removed > 0:
-            logger.debug(f"[BUFFER] Cleaned {removed} expired {modality} detections from room {room}")
+            self.version += 1
+            logger.debug("[BUFFER] Cleaned %d expired %s detections from room %s", removed, modality, room)
 
         return removed
 
@@ -301,25 +294,16 @@ class EmotionBuffer:
                     continue
 
                 # Limpiar face antiguos
-                initial_face = len(self._buffer[r]["face"])
-                self._buffer[r]["face"] = [
-                    det for det in self._buffer[r]["face"]
-                    if (now - det.get("timestamp", 0)) <= self.max_age
-                ]
-                face_removed = initial_face - len(self._buffer[r]["face"])
+                face_removed = self._drop_older_than(self._buffer[r]["face"], self.max_age, now)
                 stats["face_removed"] += face_removed
 
                 # Limpiar audio antiguos
-                initial_audio = len(self._buffer[r]["audio"])
-                self._buffer[r]["audio"] = [
-                    det for det in self._buffer[r]["audio"]
-                    if (now - det.get("timestamp", 0)) <= self.max_age
-                ]
-                audio_removed = initial_audio - len(self._buffer[r]["audio"])
+                audio_removed = self._drop_older_than(self._buffer[r]["audio"], self.max_age, now)
                 stats["audio_removed"] += audio_removed
 
                 if face_removed > 0 or audio_removed > 0:
                     stats["rooms_cleaned"] += 1
+                    self.version += 1
                     logger.info(
                         f"[BUFFER] Auto-cleanup room {r}: "
                         f"removed {face_removed} face, {audio_removed} audio (older than {self.max_age}s)"
@@ -417,6 +401,26 @@ class EmotionBuffer:
                 "partial_fusions": 0
             }
         self._timeout_stats[room][stat_key] = self._timeout_stats[room].get(stat_key, 0) + 1
+        self.version += 1
+
+    def _new_room(self) -> Dict[str, deque]:
+        """Buffers vacíos de una room, acotados a max_size"""
+        return {"face": deque(maxlen=self.max_size), "audio": deque(maxlen=self.max_size)}
+
+    def _drop_older_than(self, detections: deque, max_age: float, now: float = None) -> int:
+        """
+        Descarta por la izquierda las detecciones con más de max_age segundos.
+
+        El timestamp se pone al agregar, así que el deque está ordenado del más
+        viejo al más nuevo y basta con mirar el frente. Retorna cuántas se quitaron.
+        """
+        if now is None:
+            now = self._get_timestamp()
+        removed = 0
+        while detections and (now - detections[0].get("timestamp", 0)) > max_age:
+            detections.popleft()
+            removed += 1
+        return removed
 
     def _get_timestamp(self) -> float:
         """Obtiene timestamp actual"""
@@ -497,7 +501,7 @@ class EmotionBuffer:
             callback: Función async que recibe (event_type, room, modality, data)
         """
         self._event_callbacks.append(callback)
-        logger.debug(f"[BUFFER] Registered event callback. Total callbacks: {len(self._event_callbacks)}")
+        logger.debug("[BUFFER] Registered event callback. Total callbacks: %d", len(self._event_callbacks))
 
     def _emit_event(self, event_type: str, room: str, modality: str, data: Dict[str, Any]):
         """